@@ -0,0 +1,208 @@
+# benchmarks/corpus_generator.py
+import json
+import random
+import shutil
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Vocabulary of a university ERP, the domain of the bundled menus
+MODULES = [
+    "examination", "attendance", "admission", "hostel", "library", "fees", "transport",
+    "placement", "scholarship", "timetable", "course", "faculty", "student", "payroll",
+    "inventory", "research", "alumni", "hospital", "canteen", "sports", "grievance",
+    "certificate", "registration", "evaluation", "laboratory", "department", "semester",
+    "curriculum", "internship", "convocation",
+]
+ENTITIES = [
+    "results", "report", "register", "marks", "schedule", "allocation", "payment", "receipt",
+    "request", "approval", "summary", "profile", "record", "ledger", "statement", "card",
+    "application", "status", "history", "list", "settings", "dashboard", "notice", "form",
+    "analysis", "audit", "transfer", "booking", "renewal", "verification",
+]
+QUALIFIERS = [
+    "regular", "supply", "digital", "annual", "monthly", "daily", "pending", "approved",
+    "final", "provisional", "consolidated", "detailed", "bulk", "online", "manual",
+]
+ACTIONS = {
+    "view": "check see display show fetch retrieve access",
+    "download": "export save extract obtain pull get",
+    "update": "edit modify change revise correct amend",
+    "create": "add new generate make register submit",
+    "approve": "accept confirm authorize sanction verify",
+    "analyze": "examine study evaluate assess inspect review",
+    "print": "output hardcopy printout publish",
+    "search": "find locate lookup query browse",
+}
+SYNONYMS = [
+    "test", "assessment", "grades", "scores", "outcome", "presence", "entry", "dues",
+    "charges", "books", "lending", "bus", "route", "job", "career", "grant", "aid",
+    "calendar", "slot", "lecturer", "teacher", "pupil", "salary", "wages", "stock",
+    "project", "graduate", "clinic", "mess", "games", "complaint", "document", "enrolment",
+]
+REGIONS = ["indian", "international"]
+REGIONAL_SUFFIXES = ["kahan hai", "kaise dekhe", "check karna hai", "milega kya"]
+QUESTION_TEMPLATES = ["where can I find my {}", "how to check {}", "how do I see {}", "where is the {}"]
+COMMAND_TEMPLATES = ["show {}", "view {}", "display {}", "open {}", "download {}"]
+WORKFLOW_STAGES = ["draft", "submitted", "verified", "approved", "published"]
+
+
+@dataclass
+class CorpusDensity:
+    """How much searchable metadata each generated menu carries"""
+    primary_terms: int = 4
+    synonyms_per_term: int = 6
+    action_terms: int = 3
+    typo_variants: int = 3
+    keywords: int = 12
+    questions: int = 5
+    commands: int = 5
+    regional_phrases: int = 4
+    # Links to earlier menus, feeding the related-menu graph
+    required_menus: int = 1
+    optional_menus: int = 2
+    workflow_states: int = 1
+
+
+def typo(rng: random.Random, word: str) -> str:
+    """Drop, double or swap one character"""
+    i = rng.randrange(len(word))
+    kind = rng.randrange(3)
+    if kind == 0 and len(word) > 3:
+        return word[:i] + word[i + 1:]
+    if kind == 1 or len(word) < 2:
+        return word[:i] + word[i] + word[i:]
+    i = min(i, len(word) - 2)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def generate_menu(rng: random.Random, number: int, density: CorpusDensity) -> Dict[str, Any]:
+    """One menu dictionary in the layout of data/menus/*.json"""
+    module = rng.choice(MODULES)
+    entity = rng.choice(ENTITIES)
+    qualifier = rng.choice(QUALIFIERS)
+    words = [qualifier, module, entity]
+    name = " ".join(words).title()
+    topic = f"{module} {entity}"
+    terms = list(dict.fromkeys(words + rng.sample(MODULES + ENTITIES, density.primary_terms)))
+    terms = terms[:density.primary_terms]
+    actions = rng.sample(sorted(ACTIONS), min(density.action_terms, len(ACTIONS)))
+
+    subjects = [topic, name.lower(), f"{qualifier} {entity}"]
+
+    def phrases(templates: List[str], count: int) -> List[str]:
+        return [rng.choice(templates).format(rng.choice(subjects)) for _ in range(count)]
+
+    timestamp = "2025-02-05T00:57:25Z"
+    return {
+        "id": f"{qualifier}-{module}-{entity}-{number}",
+        "name": name,
+        "description": f"View and manage {qualifier} {module} {entity} "
+                       f"for {rng.choice(MODULES)} and {rng.choice(MODULES)} workflows",
+        "url": f"{module}/{entity}/{number}",
+        "query_enhancers": {
+            "primary_terms": {
+                term: " ".join(rng.sample(SYNONYMS, density.synonyms_per_term)) for term in terms
+            },
+            "action_terms": {action: {"primary": ACTIONS[action]} for action in actions},
+            "error_tolerant_terms": {
+                "spelling_variations": {
+                    term: sorted({typo(rng, term) for _ in range(density.typo_variants)})
+                    for term in terms
+                },
+            },
+        },
+        "search_metadata": {
+            "keywords": [
+                " ".join(rng.sample(words + rng.sample(SYNONYMS, 2), rng.randint(1, 3)))
+                for _ in range(density.keywords)
+            ],
+            "search_phrases": {
+                "questions": phrases(QUESTION_TEMPLATES, density.questions),
+                "commands": phrases(COMMAND_TEMPLATES, density.commands),
+                "regional_variations": {
+                    region: [f"{topic} {rng.choice(REGIONAL_SUFFIXES)}"
+                             for _ in range(density.regional_phrases)]
+                    for region in REGIONS
+                },
+            },
+            "related_terms": rng.sample(SYNONYMS, 5),
+        },
+        "menu_details": {
+            "category": module,
+            "subcategory": entity,
+            "context": f"Menu for {qualifier} {module} {entity}",
+            "order": rng.randint(1, 10),
+            "active": rng.random() > 0.05,
+            "permissions": rng.sample(["student", "faculty", "admin", "exam_controller"], 2),
+            "dependencies": {"required_menus": [], "optional_menus": []},
+            "workflow_state": {"previous_states": [], "next_states": []},
+        },
+        "ui_components": {
+            "icon": "clipboard-check",
+            "color_scheme": {"primary": "green-600", "secondary": "gray-200"},
+            "display": {"desktop": {"visible": True, "position": "main-menu"}},
+            "notifications": {"enabled": False},
+        },
+        "metadata": {
+            "created_at": timestamp,
+            "created_by": "benchmark",
+            "updated_at": timestamp,
+            "version": "1.0",
+            "search_index_version": "1.0",
+            "last_semantic_update": timestamp,
+            "usage_metrics": {"search_hits": rng.randint(0, 50), "access_count": 0},
+        },
+    }
+
+
+def link_menu(rng: random.Random, menu: Dict[str, Any], earlier_ids: List[str],
+              density: CorpusDensity) -> None:
+    """Give a generated menu dependencies on earlier menus and workflow states.
+
+    Uses its own random stream so the rest of the menu is the same as in
+    corpora generated without links.
+    """
+    details = menu["menu_details"]
+    linked = rng.sample(earlier_ids, min(len(earlier_ids),
+                                         density.required_menus + density.optional_menus))
+    details["dependencies"] = {
+        "required_menus": linked[:density.required_menus],
+        "optional_menus": linked[density.required_menus:],
+    }
+    module = details["category"]
+    stages = rng.sample(range(1, len(WORKFLOW_STAGES)), min(density.workflow_states,
+                                                            len(WORKFLOW_STAGES) - 1))
+    details["workflow_state"] = {
+        "previous_states": [f"{module}-{WORKFLOW_STAGES[stage - 1]}" for stage in stages],
+        "next_states": [f"{module}-{WORKFLOW_STAGES[stage]}" for stage in stages],
+    }
+
+
+def generate_corpus(data_dir: Path, size: int, seed: int = 7,
+                    density: CorpusDensity = CorpusDensity()) -> Path:
+    """Write ``size`` menus to data_dir/menus, reusing an identical earlier corpus.
+
+    Returns the menus directory. A manifest records the parameters so a
+    corpus is only regenerated when they change.
+    """
+    menus_dir = data_dir / "menus"
+    manifest_path = data_dir / "corpus.json"
+    manifest = {"size": size, "seed": seed, "density": asdict(density)}
+    if manifest_path.exists() and json.loads(manifest_path.read_text()) == manifest:
+        return menus_dir
+
+    if data_dir.exists():
+        shutil.rmtree(data_dir)
+    menus_dir.mkdir(parents=True)
+    rng = random.Random(seed)
+    link_rng = random.Random(seed ^ 0x5EED)
+    ids: List[str] = []
+    for number in range(size):
+        menu = generate_menu(rng, number, density)
+        link_menu(link_rng, menu, ids, density)
+        ids.append(menu["id"])
+        with open(menus_dir / f"menu_{number:06d}.json", "w", encoding="utf-8") as f:
+            json.dump(menu, f)
+    manifest_path.write_text(json.dumps(manifest))
+    return menus_dir
@@ -0,0 +1,78 @@
+# benchmarks/legacy_scoring.py
+"""The original linear search, frozen as the baseline for the index.
+
+Before the term index, SearchService.search scored every menu with
+``_calculate_score`` below. The parity tests check indexed rankings
+against it and the benchmarks time it, so it must not follow changes to
+the live scoring code in models/search_record.py.
+"""
+from typing import List, Set, Tuple
+from models.menu import MenuItem
+
+
+def legacy_score(query: str, query_tokens: Set[str], menu: MenuItem) -> float:
+    """SearchService._calculate_score as it was before the term index"""
+    score = 0.0
+
+    # Direct matches
+    if query in menu.name.lower():
+        score += 1.0
+    if query in menu.description.lower():
+        score += 0.8
+
+    # Primary terms matching
+    for term, synonyms in menu.query_enhancers.primary_terms.items():
+        if term.lower() in query_tokens:
+            score += 0.7
+            for syn in synonyms.split():
+                if syn.lower() in query_tokens:
+                    score += 0.1
+
+    # Action terms matching
+    for actions in menu.query_enhancers.action_terms.values():
+        for term, synonyms in actions.items():
+            if term.lower() in query_tokens:
+                score += 0.6
+                for syn in synonyms.split():
+                    if syn.lower() in query_tokens:
+                        score += 0.1
+
+    # Error tolerant terms matching
+    for variations in menu.query_enhancers.error_tolerant_terms.values():
+        for variants in variations.values():
+            if any(variant.lower() in query_tokens for variant in variants):
+                score += 0.5
+
+    # Keywords matching
+    if any(kw.lower() in query for kw in menu.search_metadata.keywords):
+        score += 0.4
+
+    # Search phrases matching
+    phrases = (
+        menu.search_metadata.search_phrases.questions +
+        menu.search_metadata.search_phrases.commands
+    )
+    if any(phrase.lower() in query for phrase in phrases):
+        score += 0.4
+
+    # Regional variations matching
+    for variations in menu.search_metadata.search_phrases.regional_variations.values():
+        if any(var.lower() in query for var in variations):
+            score += 0.3
+
+    return score
+
+
+def legacy_search(menus: List[MenuItem], query: str) -> List[Tuple[float, MenuItem]]:
+    """SearchService.search as it was before the term index: every match, best first"""
+    query = query.lower()
+    query_tokens = set(query.split())
+    results = []
+    for menu in menus:
+        if not menu.menu_details.active:
+            continue
+        score = legacy_score(query, query_tokens, menu)
+        if score > 0:
+            results.append((score, menu))
+    results.sort(key=lambda x: (-x[0], x[1].menu_details.order))
+    return results
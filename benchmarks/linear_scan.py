@@ -0,0 +1,68 @@
+# benchmarks/linear_scan.py
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Allow running as `python benchmarks/linear_scan.py` from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus_generator import generate_corpus
+from benchmarks.legacy_scoring import legacy_search
+from benchmarks.query_set import generate_query_set
+from benchmarks.run_benchmarks import DEFAULT_WORK_DIR
+from services.search_service import SearchService
+from services.storage_service import StorageService
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time SearchIndex.top_k against the original linear scan it replaced"
+    )
+    parser.add_argument("--size", type=int, default=1000, help="Synthetic corpus size")
+    parser.add_argument("--data-dir", type=Path, default=None,
+                        help="Benchmark an existing data directory instead of a synthetic corpus")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10, help="Results kept per query")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or DEFAULT_WORK_DIR / f"corpus_{args.size}"
+    if args.data_dir is None:
+        generate_corpus(data_dir, args.size, args.seed)
+    storage = StorageService(data_dir)
+    menus = storage.load_menus()
+    queries = generate_query_set(storage.menus_dir, args.queries, args.seed)
+    # The linear scan only lowercased and never corrected spelling
+    service = SearchService(storage=StorageService(data_dir), use_compiled=False, fuzzy=False,
+                            semantic=False, usage_metrics=False, normalization="legacy")
+    index = service.snapshot.index
+
+    started = time.perf_counter()
+    legacy = [
+        [(score, menu.id) for score, menu in legacy_search(menus, query)[:args.top_k]]
+        for query in queries
+    ]
+    legacy_ms = (time.perf_counter() - started) * 1000 / len(queries)
+
+    started = time.perf_counter()
+    indexed = []
+    for query in queries:
+        query = service._normalize_query(query)
+        ranked = index.top_k(query, service._tokenize(query), args.top_k)
+        indexed.append([(score, index.get(path).id) for score, path in ranked])
+    indexed_ms = (time.perf_counter() - started) * 1000 / len(queries)
+
+    # Scores are sums of the same weights, possibly added in another order
+    if [[(round(s, 9), i) for s, i in r] for r in legacy] != \
+            [[(round(s, 9), i) for s, i in r] for r in indexed]:
+        print("Rankings differ between the linear scan and the index")
+        sys.exit(1)
+    print(f"{len(menus)} menus, {len(queries)} queries, top {args.top_k}")
+    print(f"  linear scan   {legacy_ms:8.3f}ms per query")
+    print(f"  SearchIndex   {indexed_ms:8.3f}ms per query ({legacy_ms / indexed_ms:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
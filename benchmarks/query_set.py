@@ -0,0 +1,49 @@
+# benchmarks/query_set.py
+import json
+import random
+from pathlib import Path
+from typing import List
+
+from benchmarks.corpus_generator import ACTIONS, MODULES, SYNONYMS, typo
+
+
+def generate_query_set(menus_dir: Path, count: int, seed: int = 11,
+                       sample_menus: int = 500) -> List[str]:
+    """Build a replayable mix of realistic queries against a generated corpus.
+
+    Draws names, keywords, commands and questions from a sample of the
+    menus, and adds misspellings, multi-term queries and queries that
+    match nothing.
+    """
+    rng = random.Random(seed)
+    paths = sorted(menus_dir.glob("*.json"))
+    names, keywords, phrases = [], [], []
+    for path in rng.sample(paths, min(len(paths), sample_menus)):
+        with open(path, encoding="utf-8") as f:
+            menu = json.load(f)
+        names.append(menu["name"].lower())
+        keywords.extend(menu["search_metadata"]["keywords"])
+        phrases.extend(menu["search_metadata"]["search_phrases"]["commands"])
+        phrases.extend(menu["search_metadata"]["search_phrases"]["questions"])
+
+    kinds = [
+        lambda: rng.choice(names),
+        lambda: rng.choice(keywords),
+        lambda: rng.choice(phrases),
+        lambda: f"{rng.choice(sorted(ACTIONS))} {rng.choice(keywords)}",
+        lambda: " ".join(typo(rng, word) for word in rng.choice(names).split()),
+        lambda: " ".join(rng.sample(MODULES + SYNONYMS, rng.randint(1, 4))),
+        lambda: "zzz unknown query",
+    ]
+    return [rng.choice(kinds)() for _ in range(count)]
+
+
+def save_query_set(path: Path, queries: List[str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(queries, f, indent=0)
+
+
+def load_query_set(path: Path) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,236 @@
+# benchmarks/run_benchmarks.py
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Allow running as `python benchmarks/run_benchmarks.py` from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus_generator import CorpusDensity, generate_corpus
+from benchmarks.query_set import generate_query_set, load_query_set, save_query_set
+from config.settings import BASE_DIR
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+DEFAULT_WORK_DIR = BASE_DIR / "benchmarks" / "work"
+DEFAULT_RESULTS_DIR = BASE_DIR / "benchmarks" / "results"
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _touch_menus(menus_dir: Path, fraction: float) -> Dict[Path, bytes]:
+    """Rewrite a fraction of the menu files with a changed order; returns the originals"""
+    paths = sorted(menus_dir.glob("*.json"))
+    step = max(1, int(1 / fraction)) if fraction > 0 else len(paths) + 1
+    originals = {}
+    for path in paths[::step]:
+        original = path.read_bytes()
+        menu = json.loads(original)
+        menu["menu_details"]["order"] += 1
+        path.write_text(json.dumps(menu), encoding="utf-8")
+        originals[path] = original
+    return originals
+
+
+def run_case(data_dir: str, queries: List[str], reload_fraction: float,
+             linear_scan_queries: int) -> Dict[str, Any]:
+    """Benchmark one corpus; runs in a fresh process so peak RSS is per corpus"""
+    from config.settings import SEARCH_CONFIG
+    from services.search_service import SearchService
+    from services.storage_service import StorageService
+    from utils.metrics import LatencyHistogram
+
+    # Measure scoring, not the query cache or side effects
+    SEARCH_CONFIG["cache_size"] = 0
+    SEARCH_CONFIG["usage_metrics"] = False
+    data_dir = Path(data_dir)
+    storage = StorageService(data_dir)
+    storage.compiled_snapshot_path.unlink(missing_ok=True)
+
+    started = time.perf_counter()
+    service = SearchService(storage=StorageService(data_dir), use_compiled=False)
+    cold_start_ms = (time.perf_counter() - started) * 1000
+    service.compile_snapshot()
+
+    started = time.perf_counter()
+    SearchService(storage=StorageService(data_dir))
+    compiled_cold_start_ms = (time.perf_counter() - started) * 1000
+
+    originals = _touch_menus(storage.menus_dir, reload_fraction)
+    try:
+        started = time.perf_counter()
+        service.refresh()
+        reload_ms = (time.perf_counter() - started) * 1000
+    finally:
+        for path, original in originals.items():
+            path.write_bytes(original)
+    service.refresh()
+
+    latencies = LatencyHistogram(window=len(queries))
+    started = time.perf_counter()
+    for query in queries:
+        query_started = time.perf_counter()
+        service.search(query)
+        latencies.record((time.perf_counter() - query_started) * 1000)
+    elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    service.search_many(queries)
+    batch_elapsed = time.perf_counter() - started
+
+    result = {
+        "menus": len(service.snapshot.records_by_path),
+        "cold_start_ms": cold_start_ms,
+        "compiled_cold_start_ms": compiled_cold_start_ms,
+        "reload_changed_menus": len(originals),
+        "reload_ms": reload_ms,
+        "latency_ms": latencies.percentiles(),
+        "mean_latency_ms": elapsed * 1000 / max(len(queries), 1),
+        "throughput_qps": len(queries) / elapsed if elapsed else 0.0,
+        "batch_throughput_qps": len(queries) / batch_elapsed if batch_elapsed else 0.0,
+    }
+
+    if linear_scan_queries:
+        # The original linear scan, for comparison with the index
+        from benchmarks.legacy_scoring import legacy_search
+        menus = storage.load_menus()
+        sample = queries[:linear_scan_queries]
+        started = time.perf_counter()
+        for query in sample:
+            legacy_search(menus, query)
+        result["linear_scan_mean_ms"] = (time.perf_counter() - started) * 1000 / len(sample)
+
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(size: int, result: Dict[str, Any]) -> None:
+    latency = result["latency_ms"]
+    print(f"{size:>7} menus | cold {result['cold_start_ms']:9.1f}ms "
+          f"(compiled {result['compiled_cold_start_ms']:8.1f}ms) | "
+          f"reload {result['reload_ms']:8.1f}ms | "
+          f"p50 {latency['p50']:7.3f} p95 {latency['p95']:7.3f} p99 {latency['p99']:7.3f}ms | "
+          f"{result['throughput_qps']:8.0f} q/s ({result['batch_throughput_qps']:8.0f} batched) | "
+          f"{result['peak_rss_mb']:7.1f} MB")
+
+
+def compare(baseline_path: Path, results: Dict[str, Any]) -> None:
+    """Print relative changes against an earlier results file"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {run["size"]: run for run in json.load(f)["runs"]}
+    print(f"\nChange vs {baseline_path.name} (negative is better except throughput):")
+    for run in results["runs"]:
+        old = baseline.get(run["size"])
+        if old is None:
+            continue
+        changes = []
+        for metric in ("cold_start_ms", "reload_ms", "throughput_qps", "peak_rss_mb"):
+            if old.get(metric):
+                changes.append(f"{metric} {100 * (run[metric] - old[metric]) / old[metric]:+.1f}%")
+        if old.get("latency_ms", {}).get("p95"):
+            p95 = 100 * (run["latency_ms"]["p95"] - old["latency_ms"]["p95"]) / old["latency_ms"]["p95"]
+            changes.append(f"p95 {p95:+.1f}%")
+        print(f"{run['size']:>7} menus | " + ", ".join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark cold start, reload and query latency on synthetic menu corpora"
+    )
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated corpus sizes")
+    parser.add_argument("--queries", type=int, default=1000, help="Queries per corpus")
+    parser.add_argument("--query-set", type=Path, default=None,
+                        help="Replay this saved query set instead of generating one per corpus")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--reload-fraction", type=float, default=0.01,
+                        help="Fraction of menu files changed before the reload measurement")
+    parser.add_argument("--linear-scan", type=int, default=0, metavar="N",
+                        help="Also time the original linear scan on N queries")
+    parser.add_argument("--work-dir", type=Path, default=DEFAULT_WORK_DIR,
+                        help="Where generated corpora and query sets are kept between runs")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Results JSON (default: benchmarks/results/<time>_<commit>.json)")
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="Earlier results JSON to compare against")
+    for name, default in asdict(CorpusDensity()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default,
+                            help=f"Per-menu density (default {default})")
+    args = parser.parse_args()
+
+    density = CorpusDensity(**{name: getattr(args, name) for name in asdict(CorpusDensity())})
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    commit = _git_commit()
+    results = {
+        "commit": commit,
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "density": asdict(density),
+        "runs": [],
+    }
+
+    for size in sizes:
+        data_dir = args.work_dir / f"corpus_{size}"
+        started = time.perf_counter()
+        menus_dir = generate_corpus(data_dir, size, args.seed, density)
+        print(f"Corpus of {size} menus ready in {time.perf_counter() - started:.1f}s")
+
+        if args.query_set is not None:
+            queries = load_query_set(args.query_set)
+        else:
+            query_path = data_dir / f"queries_{args.queries}.json"
+            if query_path.exists():
+                queries = load_query_set(query_path)
+            else:
+                queries = generate_query_set(menus_dir, args.queries, args.seed)
+                save_query_set(query_path, queries)
+
+        # A fresh spawned process per corpus keeps peak RSS and import state separate
+        with ProcessPoolExecutor(max_workers=1,
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            result = pool.submit(run_case, str(data_dir), queries, args.reload_fraction,
+                                 args.linear_scan).result()
+        result["size"] = size
+        result["queries"] = len(queries)
+        results["runs"].append(result)
+        print_result(size, result)
+
+    output = args.output or DEFAULT_RESULTS_DIR / (
+        f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{commit or 'unknown'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare is not None:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/startup.py
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Allow running as `python benchmarks/startup.py` from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import BASE_DIR
+
+# Modules that must stay unimported until something actually needs them
+ML_MODULES = ("numpy", "scipy", "torch", "transformers", "sentence_transformers", "faiss", "sklearn")
+# Not needed for help/quit; the first query loads them
+HEAVY_AT_IMPORT = ML_MODULES + ("pydantic", "services.search_service")
+
+# Run in a fresh interpreter so nothing is cached from this process
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import search_cli
+import_ms = (time.perf_counter() - started) * 1000
+from config.settings import SEARCH_CONFIG
+SEARCH_CONFIG["usage_metrics"] = False  # Keep probe queries out of the real usage counts
+at_import = sorted(name for name in {heavy!r} if name in sys.modules)
+cli = search_cli.MenuSearchCLI()
+started = time.perf_counter()
+cli.search_service.search({query!r})
+first_query_ms = (time.perf_counter() - started) * 1000
+after_query = sorted(name for name in {ml!r} if name in sys.modules)
+print(json.dumps({{"import_ms": import_ms, "first_query_ms": first_query_ms,
+                  "heavy_at_import": at_import, "ml_after_query": after_query}}))
+"""
+
+
+def probe(query: str) -> Dict[str, Any]:
+    """Time ``import search_cli`` and the first lexical query in a new interpreter"""
+    code = _PROBE.format(heavy=HEAVY_AT_IMPORT, ml=ML_MODULES, query=query)
+    output = subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR, capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def help_quit_ms() -> float:
+    """Wall time of a whole `search_cli.py` session that only runs help and quit"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "search_cli.py"], cwd=BASE_DIR, input="help\nquit\n",
+                   capture_output=True, text=True, check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure CLI startup and fail when it exceeds its import-time budget"
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--query", default="exam results", help="First lexical query")
+    parser.add_argument("--import-budget-ms", type=float, default=100.0,
+                        help="Median budget for `import search_cli`")
+    parser.add_argument("--help-quit-budget-ms", type=float, default=300.0,
+                        help="Median budget for a help+quit session, interpreter start included")
+    parser.add_argument("--output", type=Path, default=None, help="Also write results as JSON")
+    args = parser.parse_args()
+
+    probes = [probe(args.query) for _ in range(args.runs)]
+    sessions: List[float] = [help_quit_ms() for _ in range(args.runs)]
+    results = {
+        "import_ms": statistics.median(p["import_ms"] for p in probes),
+        "first_query_ms": statistics.median(p["first_query_ms"] for p in probes),
+        "help_quit_ms": statistics.median(sessions),
+        "heavy_at_import": sorted({name for p in probes for name in p["heavy_at_import"]}),
+        "ml_after_query": sorted({name for p in probes for name in p["ml_after_query"]}),
+    }
+    print(f"import search_cli    {results['import_ms']:8.1f}ms (budget {args.import_budget_ms:.0f}ms)")
+    print(f"help + quit session  {results['help_quit_ms']:8.1f}ms "
+          f"(budget {args.help_quit_budget_ms:.0f}ms)")
+    print(f"first lexical query  {results['first_query_ms']:8.1f}ms (corpus load included)")
+
+    failures = []
+    if results["import_ms"] > args.import_budget_ms:
+        failures.append("import time over budget")
+    if results["help_quit_ms"] > args.help_quit_budget_ms:
+        failures.append("help+quit session over budget")
+    if results["heavy_at_import"]:
+        failures.append(f"imported at startup: {', '.join(results['heavy_at_import'])}")
+    if results["ml_after_query"]:
+        failures.append(f"imported by the first lexical query: {', '.join(results['ml_after_query'])}")
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({**results, "failures": failures}, f, indent=2)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
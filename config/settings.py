@@ -10,10 +10,41 @@ DATA_DIR = BASE_DIR / "data"
 # Search settings
 SEARCH_CONFIG = {
     "model_name": "sentence-transformers/all-MiniLM-L6-v2",
+    "model_cache_dir": BASE_DIR / "models_cache",
+    "model_offline": True,  # Only use the locally cached model, never download
+    "semantic_search": False,  # Build the embedding index alongside the lexical one
     "threshold_multiplier": 0.7,
+    "hybrid_fusion": "rrf",  # "rrf" (reciprocal rank) or "weighted"
+    "rrf_k": 60,
+    "hybrid_semantic_weight": 0.5,  # Used by weighted fusion
+    "hybrid_candidates": 20,  # Depth of each ranking fed into fusion
+    "hybrid_decisive_score": 2.0,  # Skip the semantic pass when the best lexical
+    "hybrid_decisive_margin": 0.5,  # match scores this high and leads by this much
+    "semantic_budget_ms": 50,  # Per-query budget before hybrid degrades to lexical
+    "semantic_workers": 2,
     "max_results": 3,
     "cache_size": 1000,
-    "max_query_length": 1000
+    "cache_ttl": None,  # Seconds; None keeps entries until evicted or reloaded
+    "max_query_length": 1000,
+    "normalization": "standard",  # Menu/query text pipeline; "legacy" only lowercases
+    "normalization_cache_size": 4096,  # Memoized normalized queries
+    "menu_cache_size": 256,
+    "fuzzy_matching": True,  # Resolve misspelled query tokens to corpus words
+    "fuzzy_max_distance": 2,
+    "fuzzy_min_length": 4,
+    "max_suggestions": 5,
+    "suggest_cache_size": 4096,
+    "usage_metrics": False,  # Count search hits/accesses in data/usage_metrics.sqlite3; the server opts in
+    "usage_flush_interval": 30,  # Seconds between batched writes of usage counts
+    "popularity_weight": 0.0,  # Score boost per log(1 + search_hits); 0 disables
+    "graph_hops": 2,  # Depth of the precomputed related-menu lists
+    "graph_max_related": 10,  # Related menus kept per menu
+    "graph_max_shared": 25,  # A workflow state or related term shared by more menus links none
+    "related_weight": 0.0,  # Share of a result's score passed to its related menus; 0 disables
+    "instrumentation": False,  # Per-stage timings in utils.metrics (search_cli.py --profile)
+    "load_workers": 8,  # Threads reading and validating menu files at load time
+    "server_workers": 4,  # Threads scoring requests for the HTTP server
+    "batch_size": 256  # Queries per sparse-matrix pass in search_many
 }
 
 # Color settings
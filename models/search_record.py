@@ -0,0 +1,169 @@
+# models/search_record.py
+import copy
+import math
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple
+from utils.text_pipeline import NormalizationPipeline, get_pipeline
+
+if TYPE_CHECKING:  # Unpickling records from a compiled snapshot needs no pydantic
+    from models.menu import MenuItem
+
+# Score weights, identical to the original linear scan (benchmarks/legacy_scoring.py)
+NAME_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.8
+PRIMARY_TERM_WEIGHT = 0.7
+ACTION_TERM_WEIGHT = 0.6
+SYNONYM_WEIGHT = 0.1
+ERROR_TOLERANT_WEIGHT = 0.5
+KEYWORD_WEIGHT = 0.4
+PHRASE_WEIGHT = 0.4
+REGIONAL_WEIGHT = 0.3
+
+# Slots 0 and 1 are always the direct name/description matches
+NAME_SLOT = 0
+DESCRIPTION_SLOT = 1
+
+
+class SearchRecord:
+    """Compact search-time view of a menu.
+
+    Holds only what scoring and sorting read; the full MenuItem is loaded
+    from ``path`` when a result is displayed. It is the menu's scoring
+    plan, compiled once: every score contribution gets a slot, numbered in
+    the order the contributions are summed. ``parents`` holds the slot a synonym depends
+    on (-1 when unconditional). All matched text is normalized with the
+    given pipeline (default SEARCH_CONFIG["normalization"]), which must
+    also normalize the queries.
+    """
+
+    __slots__ = ('path', 'id', 'name', 'description', 'active', 'order', 'category',
+                 'subcategory', 'context', 'permissions', 'weights', 'parents',
+                 'token_triggers', 'substring_triggers', 'vocabulary', 'stored_search_hits',
+                 'search_hits', 'suggestions',
+                 'required_menus', 'optional_menus', 'previous_states', 'next_states',
+                 'related_terms')
+
+    def __init__(self, path: Path, menu: 'MenuItem',
+                 pipeline: Optional[NormalizationPipeline] = None):
+        pipeline = pipeline or get_pipeline()
+        normalize, words = pipeline.text, pipeline.words
+        self.path = path
+        self.id = menu.id
+        self.name = normalize(menu.name)
+        self.description = normalize(menu.description)
+        self.active = menu.menu_details.active
+        self.order = menu.menu_details.order
+        self.category = menu.menu_details.category
+        self.subcategory = menu.menu_details.subcategory
+        self.context = menu.menu_details.context
+        self.permissions = tuple(menu.menu_details.permissions)
+        # Links to other menus, read by MenuGraph
+        details = menu.menu_details
+        self.required_menus = tuple(details.dependencies.required_menus)
+        self.optional_menus = tuple(details.dependencies.optional_menus)
+        self.previous_states = tuple(details.workflow_state.previous_states)
+        self.next_states = tuple(details.workflow_state.next_states)
+        self.related_terms = tuple(dict.fromkeys(
+            normalize(term) for term in menu.search_metadata.related_terms
+        ))
+        # Hits saved in the menu file; search_hits adds those counted since
+        self.stored_search_hits = menu.metadata.usage_metrics.search_hits
+        self.search_hits = self.stored_search_hits
+        # Display texts offered as autocomplete suggestions
+        self.suggestions = tuple(dict.fromkeys(
+            text for text in [menu.name, *menu.search_metadata.keywords,
+                              *menu.search_metadata.search_phrases.commands]
+            if text.strip()
+        ))
+
+        weights: List[float] = [NAME_WEIGHT, DESCRIPTION_WEIGHT]
+        parents: List[int] = [-1, -1]
+        # (token, slot) pairs matched against the query token set
+        token_triggers: List[Tuple[str, int]] = []
+        # (pattern, slot) pairs matched as substrings of the query
+        substring_triggers: List[Tuple[str, int]] = []
+        # Correctly spelled words that misspelled query tokens may resolve to
+        vocabulary: Set[str] = set(self.name.split())
+
+        def add_slot(weight: float, parent: int = -1) -> int:
+            weights.append(weight)
+            parents.append(parent)
+            return len(weights) - 1
+
+        enhancers = menu.query_enhancers
+        for term, synonyms in enhancers.primary_terms.items():
+            slot = add_slot(PRIMARY_TERM_WEIGHT)
+            token_triggers.append((normalize(term), slot))
+            vocabulary.add(normalize(term))
+            for syn in words(synonyms):
+                token_triggers.append((syn, add_slot(SYNONYM_WEIGHT, slot)))
+                vocabulary.add(syn)
+
+        for actions in enhancers.action_terms.values():
+            for term, synonyms in actions.items():
+                slot = add_slot(ACTION_TERM_WEIGHT)
+                token_triggers.append((normalize(term), slot))
+                vocabulary.add(normalize(term))
+                for syn in words(synonyms):
+                    token_triggers.append((syn, add_slot(SYNONYM_WEIGHT, slot)))
+                    vocabulary.add(syn)
+
+        for variations in enhancers.error_tolerant_terms.values():
+            for variants in variations.values():
+                slot = add_slot(ERROR_TOLERANT_WEIGHT)
+                for variant in variants:
+                    token_triggers.append((normalize(variant), slot))
+
+        metadata = menu.search_metadata
+        slot = add_slot(KEYWORD_WEIGHT)
+        for kw in metadata.keywords:
+            substring_triggers.append((normalize(kw), slot))
+            vocabulary.update(words(kw))
+
+        slot = add_slot(PHRASE_WEIGHT)
+        phrases = metadata.search_phrases.questions + metadata.search_phrases.commands
+        for phrase in phrases:
+            substring_triggers.append((normalize(phrase), slot))
+            vocabulary.update(words(phrase))
+
+        for variations in metadata.search_phrases.regional_variations.values():
+            slot = add_slot(REGIONAL_WEIGHT)
+            for var in variations:
+                substring_triggers.append((normalize(var), slot))
+
+        self.weights = tuple(weights)
+        self.parents = tuple(parents)
+        self.token_triggers = tuple(token_triggers)
+        self.substring_triggers = tuple(substring_triggers)
+        self.vocabulary = tuple(sorted(vocabulary))
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def with_search_hits(self, search_hits: int) -> 'SearchRecord':
+        """Copy of this record with an updated usage count"""
+        record = copy.copy(self)
+        record.search_hits = search_hits
+        return record
+
+    def popularity(self, weight: float) -> float:
+        """Ranking boost for popular menus; 0.0 when the weight is 0"""
+        if not weight:
+            return 0.0
+        return weight * math.log1p(self.search_hits)
+
+    def score(self, slots: Set[int]) -> float:
+        """Sum the weights of matched slots in slot order"""
+        score = 0.0
+        parents = self.parents
+        weights = self.weights
+        for slot in sorted(slots):
+            parent = parents[slot]
+            if parent >= 0 and parent not in slots:
+                continue
+            score += weights[slot]
+        return score
@@ -0,0 +1,47 @@
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Allow running as `python scripts/compile_menus.py` from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import DATA_DIR
+from services.search_service import SearchService
+from services.storage_service import StorageService
+
+
+def compile_menus(data_dir: Path, output: Path = None) -> Path:
+    """Validate every menu file and write the corpus and its index to one snapshot"""
+    storage = StorageService(data_dir)
+    service = SearchService(storage=storage, use_compiled=False)
+    if storage.last_load_report is not None:
+        print(storage.last_load_report.summary())
+    size = service.compile_snapshot(output)
+    output = output or storage.compiled_snapshot_path
+    print(f"Compiled {len(service.snapshot.records_by_path)} menus into {output} ({size} bytes)")
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile data/menus into a pre-validated binary snapshot for fast startup"
+    )
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR,
+                        help="Directory containing a 'menus' folder")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Snapshot path (default: <data-dir>/menus.snapshot)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        compile_menus(args.data_dir, args.output)
+    except Exception as e:
+        print(f"Error compiling menus: {str(e)}")
+        sys.exit(1)
+    print(f"Done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
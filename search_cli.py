@@ -1,13 +1,24 @@
 # search_cli.py
+import argparse
+import json
 import sys
+import time
 from datetime import datetime
+from itertools import islice
 import os
-from typing import List, Tuple
-from models.menu import MenuItem
-from services.search_service import SearchService
+from typing import TYPE_CHECKING, Dict, List, Optional, TextIO, Tuple
+from config.settings import SEARCH_CONFIG
 from utils.logger import get_logger
+from utils.metrics import LatencyHistogram, get_metrics
+
+# pydantic models and the services are imported when the first query needs
+# them, so help, quit and startup stay fast
+if TYPE_CHECKING:
+    from models.menu import MenuItem
+    from services.search_service import SearchService
 
 logger = get_logger()
+metrics = get_metrics()
 
 COLORS = {
     'HEADER': '\033[95m',
@@ -21,12 +32,23 @@ COLORS = {
 }
 
 class MenuSearchCLI:
-    def __init__(self):
-        self.search_service = SearchService()
+    def __init__(self, profile: bool = False):
+        self.profile = profile
+        if profile:
+            metrics.enable()
+        self._search_service: Optional['SearchService'] = None
         self.current_time = datetime.strptime("2025-02-05 02:29:27", "%Y-%m-%d %H:%M:%S")
         self.current_user = "sibinc"
 
-    def print_menu_result(self, score: float, menu: MenuItem):
+    @property
+    def search_service(self) -> 'SearchService':
+        """The search service, loading the menu corpus on first use"""
+        if self._search_service is None:
+            from services.search_service import SearchService
+            self._search_service = SearchService()
+        return self._search_service
+
+    def print_menu_result(self, score: float, menu: 'MenuItem'):
         """Print a formatted menu search result"""
         print(f"\n{COLORS['BOLD']}{COLORS['GREEN']}Match Score: {score:.2f}{COLORS['RESET']}")
         print(f"{COLORS['CYAN']}Name:{COLORS['RESET']} {menu.name}")
@@ -44,6 +66,17 @@ class MenuSearchCLI:
         
         print(f"{COLORS['YELLOW']}{'-' * 50}{COLORS['RESET']}")
 
+    def print_profile(self, stages: List[Tuple[str, float]]):
+        """Print the per-stage timing breakdown of the last search"""
+        total = next((ms for name, ms in stages if name == "search.total"), 0.0)
+        print(f"\n{COLORS['BOLD']}Profile:{COLORS['RESET']}")
+        for name, ms in stages:
+            # Only search and index stages run inside search.total; the corpus
+            # load on first use (reload.*) happens before it starts
+            within = name.startswith(("search.", "index.")) and name != "search.total"
+            share = f"{100 * ms / total:5.1f}%" if total and within else ""
+            print(f"  {name:<28} {ms:9.3f} ms {share}")
+
     def print_welcome_message(self):
         """Print welcome message and usage instructions"""
         print(f"\n{COLORS['HEADER']}Welcome to Menu Search System!{COLORS['RESET']}")
@@ -121,7 +154,12 @@ class MenuSearchCLI:
             
         # Treat everything else as a search query
         try:
-            results = self.search_service.search(command)
+            if self.profile:
+                with metrics.trace() as stages:
+                    results = self.search_service.search(command)
+                self.print_profile(stages)
+            else:
+                results = self.search_service.search(command)
             
             if not results:
                 print(f"\n{COLORS['YELLOW']}No results found. Try:{COLORS['RESET']}")
@@ -142,6 +180,52 @@ class MenuSearchCLI:
             
         return True
 
+    def run_batch(self, source: TextIO, sink: TextIO, batch_size: Optional[int] = None,
+                  limit: Optional[int] = None) -> Dict[str, float]:
+        """Stream queries (one per line) to NDJSON results, one line per query.
+
+        Queries are read and ranked ``batch_size`` at a time with
+        ``search_many``, so memory stays bounded however long the input is,
+        and results are written in input order. Returns throughput and
+        per-batch latency stats.
+        """
+        batch_size = batch_size or SEARCH_CONFIG["batch_size"]
+        lines = (line.rstrip("\r\n") for line in source)
+        latencies = LatencyHistogram()
+        queries = 0
+        started = time.perf_counter()
+        while True:
+            batch = list(islice(lines, batch_size))
+            if not batch:
+                break
+            batch_started = time.perf_counter()
+            # Blank lines get an empty answer, as in the interactive loop,
+            # rather than the 1.8 every menu scores against an empty query
+            ranked = iter(self.search_service.search_many(
+                [query for query in batch if query.strip()], limit))
+            latencies.record((time.perf_counter() - batch_started) * 1000)
+            for query in batch:
+                results = next(ranked) if query.strip() else []
+                sink.write(json.dumps({
+                    "query": query,
+                    "results": [
+                        {"score": score, "id": menu.id, "name": menu.name, "url": menu.url}
+                        for score, menu in results
+                    ],
+                }) + "\n")
+            sink.flush()
+            queries += len(batch)
+
+        elapsed = time.perf_counter() - started
+        return {
+            "queries": queries,
+            "batches": latencies.count,
+            "elapsed_s": elapsed,
+            "throughput_qps": queries / elapsed if elapsed else 0.0,
+            "mean_query_ms": elapsed * 1000 / queries if queries else 0.0,
+            **{f"batch_{name}_ms": ms for name, ms in latencies.percentiles().items()},
+        }
+
     def run(self):
         """Main CLI loop"""
         try:
@@ -168,13 +252,50 @@ class MenuSearchCLI:
 
 def main():
     """Entry point for the CLI application"""
+    parser = argparse.ArgumentParser(description="Interactive menu search")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print a per-stage timing breakdown for every query")
+    parser.add_argument("--batch", nargs="?", const="-", default=None, metavar="FILE",
+                        help="Non-interactive: read queries line by line from FILE "
+                             "(default stdin) and write NDJSON results to stdout")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Queries ranked per batch (default SEARCH_CONFIG['batch_size'])")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Results per query in batch mode (default SEARCH_CONFIG['max_results'])")
+    args = parser.parse_args()
+    if args.batch is not None:
+        run_batch_mode(args)
+        return
     try:
-        cli = MenuSearchCLI()
+        cli = MenuSearchCLI(profile=args.profile)
         cli.run()
     except Exception as e:
         logger.error(f"Failed to start application: {str(e)}")
         print(f"\n{COLORS['RED']}Failed to start the application. Please check the logs.{COLORS['RESET']}\n")
         sys.exit(1)
 
+def run_batch_mode(args):
+    """Pipe queries through one SearchService; stats go to stderr, results to stdout"""
+    try:
+        cli = MenuSearchCLI()
+        if args.batch == "-":
+            stats = cli.run_batch(sys.stdin, sys.stdout, args.batch_size, args.limit)
+        else:
+            with open(args.batch, encoding="utf-8") as source:
+                stats = cli.run_batch(source, sys.stdout, args.batch_size, args.limit)
+    except BrokenPipeError:
+        sys.exit(0)  # Downstream consumer (e.g. `head`) stopped reading
+    except Exception as e:
+        logger.error(f"Batch search failed: {str(e)}")
+        print(f"Batch search failed: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    print(
+        f"{stats['queries']} queries in {stats['elapsed_s']:.2f}s "
+        f"({stats['throughput_qps']:.0f} q/s, {stats['mean_query_ms']:.3f} ms/query); "
+        f"batch latency p50 {stats['batch_p50_ms']:.1f} p95 {stats['batch_p95_ms']:.1f} "
+        f"p99 {stats['batch_p99_ms']:.1f} ms over {stats['batches']} batches",
+        file=sys.stderr,
+    )
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
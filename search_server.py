@@ -0,0 +1,35 @@
+# search_server.py
+import argparse
+import asyncio
+import sys
+from services.search_server import SearchServer
+from services.search_service import SearchService
+from utils.logger import get_logger, setup_logging
+
+logger = get_logger()
+
+
+def main():
+    """Entry point for the HTTP search server"""
+    parser = argparse.ArgumentParser(description="Serve menu search over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Scoring threads (default: SEARCH_CONFIG['server_workers'])")
+    args = parser.parse_args()
+
+    setup_logging()
+    try:
+        # The long-running server is what counts menu popularity
+        service = SearchService(background_refresh=True, usage_metrics=True)
+        server = SearchServer(service, host=args.host, port=args.port, workers=args.workers)
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        logger.error(f"Search server failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
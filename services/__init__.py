@@ -1,4 +1,16 @@
-from .storage_service import StorageService
-from .search_service import SearchService
+# Exports resolve on first access, so importing one submodule does not load
+# pydantic and every other service along with the package.
+_EXPORTS = {
+    'StorageService': 'storage_service',
+    'SearchService': 'search_service',
+    'SearchResponse': 'search_service',
+}
 
-__all__ = ['StorageService', 'SearchService']
\ No newline at end of file
+__all__ = ['StorageService', 'SearchService', 'SearchResponse']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        from importlib import import_module
+        return getattr(import_module(f'.{_EXPORTS[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
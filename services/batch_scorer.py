@@ -0,0 +1,185 @@
+# services/batch_scorer.py
+import copy
+from typing import AbstractSet, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from scipy import sparse
+
+# Candidates within this distance of the k-th matrix score are re-scored exactly.
+# Matrix sums differ from the sequential sum only by float rounding (~1e-15).
+_RESCORE_TOLERANCE = 1e-6
+
+
+class BatchScorer:
+    """Scores many queries at once with sparse matrix products.
+
+    Every scoring slot of every indexed record is a column ("clause"). A
+    query x token matrix times the token x clause matrix marks the
+    token-triggered clauses, and substring matches are added per query.
+    Synonym clauses whose parent term did not match are dropped, and a
+    clause x record weight matrix turns the rest into scores. Candidates
+    near the k-th score are then re-scored in slot order, so
+    rankings are identical to ``SearchIndex.top_k``.
+    """
+
+    def __init__(self, index):
+        self._index = index
+        self._records = index.records()
+        self._row_of: Dict[Hashable, int] = {}
+        self._vocabulary: Dict[str, int] = {}
+
+        offsets = np.zeros(len(self._records) + 1, dtype=np.int64)
+        for row, record in enumerate(self._records):
+            offsets[row + 1] = offsets[row] + len(record.weights)
+        self._offsets = offsets
+        n_clauses = int(offsets[-1])
+
+        clause_record = np.empty(n_clauses, dtype=np.int64)
+        clause_parent = np.full(n_clauses, -1, dtype=np.int64)
+        clause_weight = np.empty(n_clauses, dtype=np.float64)
+        token_ids: List[int] = []
+        token_clauses: List[int] = []
+
+        for row, record in enumerate(self._records):
+            self._row_of[record.path] = row
+            base = int(offsets[row])
+            end = base + len(record.weights)
+            clause_record[base:end] = row
+            clause_weight[base:end] = record.weights
+            parents = np.asarray(record.parents, dtype=np.int64)
+            clause_parent[base:end] = np.where(parents >= 0, parents + base, -1)
+            for token, slot in record.token_triggers:
+                token_ids.append(self._vocabulary.setdefault(token, len(self._vocabulary)))
+                token_clauses.append(base + slot)
+
+        self._n_clauses = n_clauses
+        self._clause_record = clause_record
+        self._clause_parent = clause_parent
+        self._clause_weight = clause_weight
+        self._token_clauses = sparse.csr_matrix(
+            (np.ones(len(token_ids), dtype=np.int32), (token_ids, token_clauses)),
+            shape=(len(self._vocabulary), n_clauses),
+        )
+
+    def with_index(self, index) -> 'BatchScorer':
+        """This scorer's matrices over an index with the same records in the same order"""
+        scorer = copy.copy(self)
+        scorer._index = index
+        scorer._records = index.records()
+        return scorer
+
+    def _matched_clauses(self, queries: Sequence[str], token_sets: Sequence[Set[str]],
+                         corrected: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (query row, clause) pairs of matched clauses, sorted and de-duplicated"""
+        n_queries = len(queries)
+        q_rows, q_cols = [], []
+        for qi, tokens in enumerate(token_sets):
+            for token in tokens:
+                token_id = self._vocabulary.get(token)
+                if token_id is not None:
+                    q_rows.append(qi)
+                    q_cols.append(token_id)
+        query_tokens = sparse.csr_matrix(
+            (np.ones(len(q_rows), dtype=np.int32), (q_rows, q_cols)),
+            shape=(n_queries, len(self._vocabulary)),
+        )
+        matched = query_tokens @ self._token_clauses
+
+        # Substring matches (name, description, phrases) come from the index per query
+        t_rows, t_cols = [], []
+        for qi, query in enumerate(queries):
+            texts = [query] if corrected[qi] is None else [query, corrected[qi]]
+            for text in texts:
+                for key, slots in self._index.match_text_slots(text).items():
+                    base = int(self._offsets[self._row_of[key]])
+                    for slot in slots:
+                        t_rows.append(qi)
+                        t_cols.append(base + slot)
+        if t_rows:
+            matched = matched + sparse.csr_matrix(
+                (np.ones(len(t_rows), dtype=np.int32), (t_rows, t_cols)),
+                shape=(n_queries, self._n_clauses),
+            )
+
+        matched = sparse.csr_matrix(matched)
+        matched.sum_duplicates()
+        matched.sort_indices()
+        rows = np.repeat(np.arange(n_queries, dtype=np.int64), np.diff(matched.indptr))
+        return rows, matched.indices.astype(np.int64)
+
+    def top_k_many(self, queries: Sequence[str], token_sets: Sequence[Set[str]], k: int,
+                   corrected: Optional[Sequence[Optional[str]]] = None,
+                   popularity_weight: float = 0.0,
+                   allowed: Optional[AbstractSet[Hashable]] = None) -> List[List[Tuple[float, Hashable]]]:
+        """Rank every query like SearchIndex.top_k, best first.
+
+        ``allowed`` restricts every query to those keys before scoring.
+        """
+        if k <= 0 or not queries:
+            return [[] for _ in queries]
+        if corrected is None:
+            corrected = [None] * len(queries)
+        rows, clauses = self._matched_clauses(queries, token_sets, corrected)
+        if allowed is not None:
+            permitted = np.zeros(len(self._records), dtype=bool)
+            permitted[[self._row_of[key] for key in allowed if key in self._row_of]] = True
+            in_scope = permitted[self._clause_record[clauses]]
+            rows, clauses = rows[in_scope], clauses[in_scope]
+
+        # Keep synonym clauses only when their parent term matched in the same query
+        parents = self._clause_parent[clauses]
+        conditional = parents >= 0
+        codes = rows * self._n_clauses + clauses
+        wanted = rows[conditional] * self._n_clauses + parents[conditional]
+        found = np.searchsorted(codes, wanted)
+        found[found >= len(codes)] = 0
+        keep = np.ones(len(clauses), dtype=bool)
+        keep[conditional] = codes[found] == wanted
+        rows, clauses = rows[keep], clauses[keep]
+
+        record_rows = self._clause_record[clauses]
+        scores = sparse.csr_matrix(
+            (self._clause_weight[clauses], (rows, record_rows)),
+            shape=(len(queries), len(self._records)),
+        )
+        scores.sum_duplicates()
+        row_starts = np.searchsorted(rows, np.arange(len(queries) + 1))
+
+        popularity = None
+        if popularity_weight:
+            popularity = np.array([record.popularity(popularity_weight) for record in self._records])
+
+        results = []
+        for qi in range(len(queries)):
+            start, end = scores.indptr[qi], scores.indptr[qi + 1]
+            candidates, approx = scores.indices[start:end], scores.data[start:end]
+            if popularity is not None:
+                approx = approx + popularity[candidates]
+            if len(approx) > k:
+                kth = -np.partition(-approx, k - 1)[k - 1]
+                candidates = candidates[approx >= kth - _RESCORE_TOLERANCE]
+            results.append(self._exact_top_k(
+                set(candidates.tolist()),
+                record_rows[row_starts[qi]:row_starts[qi + 1]],
+                clauses[row_starts[qi]:row_starts[qi + 1]],
+                k,
+                popularity_weight,
+            ))
+        return results
+
+    def _exact_top_k(self, candidates: Set[int], record_rows: np.ndarray, clauses: np.ndarray,
+                     k: int, popularity_weight: float) -> List[Tuple[float, Hashable]]:
+        """Re-score candidates in slot order and rank them exactly"""
+        slots: Dict[int, Set[int]] = {}
+        for row, clause in zip(record_rows.tolist(), clauses.tolist()):
+            if row in candidates:
+                slots.setdefault(row, set()).add(clause - int(self._offsets[row]))
+
+        ranked = []
+        for row, matched in slots.items():
+            record = self._records[row]
+            score = record.score(matched)
+            if score > 0:
+                score += record.popularity(popularity_weight)
+                ranked.append((-score, record.order, record.path))
+        ranked.sort()
+        return [(-neg_score, key) for neg_score, _, key in ranked[:k]]
@@ -0,0 +1,86 @@
+# services/corpus_snapshot.py
+import gc
+import mmap
+import os
+import pickle
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+from models.search_record import SearchRecord
+from services.search_index import SearchIndex
+from services.storage_service import FileSignature
+from utils.logger import get_logger
+
+logger = get_logger()
+
+MAGIC = b"SMENUSNP"
+# Bump whenever SearchRecord or the index structures change shape
+FORMAT_VERSION = 11
+# magic, format version, payload length
+_HEADER = struct.Struct("<8sIQ")
+
+
+class CompiledCorpus(NamedTuple):
+    """Pre-validated search records and index read from a compiled snapshot"""
+    menus_dir: str
+    signatures: Dict[Path, FileSignature]
+    records_by_path: Dict[Path, SearchRecord]
+    index: SearchIndex
+    created_at: datetime
+    normalization: str  # Name of the text pipeline the records were built with
+
+
+def write_compiled_snapshot(path: Path, corpus: CompiledCorpus) -> int:
+    """Write the corpus to a versioned binary snapshot; returns its size in bytes.
+
+    The file is written next to its destination and renamed into place, so
+    a service starting concurrently never sees a partial snapshot.
+    """
+    payload = pickle.dumps(corpus._asdict(), protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(payload)))
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return _HEADER.size + len(payload)
+
+
+def read_compiled_snapshot(path: Path) -> Optional[CompiledCorpus]:
+    """Memory-map and decode a compiled snapshot.
+
+    Returns None when the file is missing, truncated or was written by an
+    incompatible format version. Snapshots are trusted local build
+    artifacts; never load one from an untrusted source. The mapping only
+    saves copying the file into a bytes object; the decoded records and
+    index are private to the calling process.
+    """
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < _HEADER.size:
+                logger.warning(f"Ignoring truncated menu snapshot {path}")
+                return None
+            magic, version, length = _HEADER.unpack_from(mm)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                logger.warning(f"Ignoring menu snapshot {path} with format version {version}")
+                return None
+            if len(mm) < _HEADER.size + length:
+                logger.warning(f"Ignoring truncated menu snapshot {path}")
+                return None
+            # Unpickling allocates millions of objects; cyclic GC passes would dominate
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                with memoryview(mm) as view:
+                    data: Dict[str, Any] = pickle.loads(view[_HEADER.size:_HEADER.size + length])
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error(f"Failed to read menu snapshot {path}: {e}")
+        return None
+    return CompiledCorpus(**data)
@@ -0,0 +1,133 @@
+# services/filter_index.py
+from dataclasses import dataclass
+from typing import AbstractSet, Dict, FrozenSet, Hashable, Iterable, Optional, Set, Tuple
+from models.search_record import SearchRecord
+from utils.lru_cache import LRUCache
+
+# Record attributes that filters match exactly
+FILTER_FIELDS = ("category", "subcategory", "context")
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    """Restricts a search to a slice of the corpus; None means unrestricted.
+
+    ``permissions`` are the caller's roles: a menu is visible when it
+    requires none or shares at least one of them. Instances are hashable
+    so they can be part of cache keys.
+    """
+    category: Optional[str] = None
+    subcategory: Optional[str] = None
+    context: Optional[str] = None
+    permissions: Optional[FrozenSet[str]] = None
+
+    def __post_init__(self):
+        if self.permissions is not None and not isinstance(self.permissions, frozenset):
+            object.__setattr__(self, 'permissions', frozenset(self.permissions))
+
+    @property
+    def active(self) -> bool:
+        return any(getattr(self, name) is not None for name in FILTER_FIELDS + ("permissions",))
+
+
+class FilterIndex:
+    """Value -> key-set indexes over menu_details attributes.
+
+    Built at load time next to the search index, so a filter resolves to
+    the set of allowed menus with a few set intersections, memoized per
+    index. Reloads derive a new index that only rebuilds the sets touched
+    by changed menus.
+    """
+
+    def __init__(self, records: Iterable[SearchRecord] = ()):
+        self._keys: Dict[Hashable, Tuple] = {}
+        self._values: Dict[str, Dict[str, FrozenSet[Hashable]]] = {name: {} for name in FILTER_FIELDS}
+        self._roles: Dict[str, FrozenSet[Hashable]] = {}
+        self._public: FrozenSet[Hashable] = frozenset()
+        self._rebuild(records, ())
+        self._cache = LRUCache(256)
+
+    @staticmethod
+    def _attributes(record: SearchRecord) -> Tuple:
+        return tuple(getattr(record, name) for name in FILTER_FIELDS) + (record.permissions,)
+
+    def _rebuild(self, fresh: Iterable[SearchRecord], stale: Iterable[Hashable]) -> None:
+        """Drop stale keys and add fresh records, replacing only the touched sets"""
+        removed: Dict[Tuple[str, str], Set[Hashable]] = {}
+        added: Dict[Tuple[str, str], Set[Hashable]] = {}
+        for key in stale:
+            attributes = self._keys.pop(key, None)
+            if attributes is not None:
+                for touched in self._entries(attributes):
+                    removed.setdefault(touched, set()).add(key)
+        for record in fresh:
+            if record.active:
+                attributes = self._attributes(record)
+                self._keys[record.path] = attributes
+                for touched in self._entries(attributes):
+                    added.setdefault(touched, set()).add(record.path)
+
+        for touched in set(removed) | set(added):
+            field, value = touched
+            if field == "public":
+                keys = (self._public - removed.get(touched, set())) | added.get(touched, set())
+                self._public = frozenset(keys)
+                continue
+            table = self._roles if field == "permissions" else self._values[field]
+            keys = (table.get(value, frozenset()) - removed.get(touched, set())) | added.get(touched, set())
+            if keys:
+                table[value] = frozenset(keys)
+            else:
+                table.pop(value, None)
+
+    @staticmethod
+    def _entries(attributes: Tuple) -> Iterable[Tuple[str, str]]:
+        *values, permissions = attributes
+        for name, value in zip(FILTER_FIELDS, values):
+            yield name, value
+        if permissions:
+            for role in permissions:
+                yield "permissions", role
+        else:
+            yield "public", ""
+
+    def updated(self, changed: Iterable[SearchRecord],
+                removed: Iterable[Hashable] = ()) -> 'FilterIndex':
+        """Return a new index with changed menus re-indexed and removed ones dropped"""
+        changed = list(changed)
+        index = FilterIndex.__new__(FilterIndex)
+        index._keys = dict(self._keys)
+        index._values = {name: dict(table) for name, table in self._values.items()}
+        index._roles = dict(self._roles)
+        index._public = self._public
+        index._rebuild(changed, set(removed) | {record.path for record in changed})
+        index._cache = LRUCache(256)
+        return index
+
+    def values(self, field: str) -> Tuple[str, ...]:
+        """Distinct values of a filter field among indexed menus"""
+        return tuple(sorted(self._values[field]))
+
+    def allowed(self, filters: Optional[SearchFilters]) -> Optional[AbstractSet[Hashable]]:
+        """Keys of menus passing the filters, or None when nothing is filtered"""
+        if filters is None or not filters.active:
+            return None
+        cached = self._cache.get(filters)
+        if cached is not None:
+            return cached
+
+        sets = []
+        for name in FILTER_FIELDS:
+            value = getattr(filters, name)
+            if value is not None:
+                sets.append(self._values[name].get(value, frozenset()))
+        if filters.permissions is not None:
+            visible = set(self._public)
+            for role in filters.permissions:
+                visible.update(self._roles.get(role, ()))
+            sets.append(visible)
+
+        sets.sort(key=len)
+        allowed = frozenset(sets[0]).intersection(*sets[1:])
+        self._cache.put(filters, allowed)
+        return allowed
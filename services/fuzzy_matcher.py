@@ -0,0 +1,101 @@
+# services/fuzzy_matcher.py
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Set
+from utils.lru_cache import LRUCache
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance, or max_distance + 1 once exceeded"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyMatcher:
+    """SymSpell-style deletion dictionary over the corpus vocabulary.
+
+    Every vocabulary word is stored under each string obtainable by
+    deleting up to ``max_distance`` characters. A misspelled token is
+    resolved by generating its own deletes, looking them up, and verifying
+    the few candidates with a bounded edit distance.
+    """
+
+    def __init__(self, words: Iterable[str], max_distance: int = 2, min_length: int = 4,
+                 cache_size: int = 10000):
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self._counts: Dict[str, int] = {}
+        for word in words:
+            self._counts[word] = self._counts.get(word, 0) + 1
+
+        self._deletes: Dict[str, List[str]] = {}
+        for word in self._counts:
+            for variant in self._variants(word, self._distance_for(word)):
+                self._deletes.setdefault(variant, []).append(word)
+        self._cache = LRUCache(cache_size)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._counts
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def _distance_for(self, word: str) -> int:
+        """Allow one edit in short words and max_distance in longer ones"""
+        return 1 if len(word) <= 5 else self.max_distance
+
+    @staticmethod
+    def _variants(word: str, distance: int) -> Set[str]:
+        """The word and every string reachable by deleting up to distance characters"""
+        variants = {word}
+        for n in range(1, min(distance, len(word) - 1) + 1):
+            for positions in combinations(range(len(word)), n):
+                skip = set(positions)
+                variants.add("".join(ch for i, ch in enumerate(word) if i not in skip))
+        return variants
+
+    def correct(self, token: str) -> Optional[str]:
+        """Return the closest vocabulary word for a token that is not in the vocabulary.
+
+        Ties on distance go to the word used by more menus, then the
+        alphabetically first. Tokens shorter than min_length are left alone.
+        """
+        if len(token) < self.min_length or token in self._counts:
+            return None
+        cached = self._cache.get(token, False)
+        if cached is not False:
+            return cached
+
+        distance = self._distance_for(token)
+        best = None
+        best_key = None
+        seen: Set[str] = set()
+        for variant in self._variants(token, distance):
+            for word in self._deletes.get(variant, ()):
+                if word in seen:
+                    continue
+                seen.add(word)
+                found = edit_distance(token, word, distance)
+                if found > distance:
+                    continue
+                key = (found, -self._counts[word], word)
+                if best_key is None or key < best_key:
+                    best, best_key = word, key
+
+        self._cache.put(token, best)
+        return best
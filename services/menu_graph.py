@@ -0,0 +1,331 @@
+# services/menu_graph.py
+import heapq
+from array import array
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from config.settings import SEARCH_CONFIG
+from models.search_record import SearchRecord
+
+# Edge weights; a pair linked in several ways keeps the strongest
+REQUIRED_WEIGHT = 1.0
+OPTIONAL_WEIGHT = 0.6
+WORKFLOW_WEIGHT = 0.8
+RELATED_TERM_WEIGHT = 0.3
+
+_NO_RELATED = (array('i'), array('d'))
+
+
+class MenuGraph:
+    """Undirected weighted graph of active menus, with precomputed related lists.
+
+    Menus are linked when one lists the other in required_menus or
+    optional_menus, when one's next_states meet the other's
+    previous_states (or name the other menu's id), and when they share a
+    related term. A workflow state or related term shared by more than
+    ``max_shared`` menus links none of them, so common words do not turn
+    into hubs.
+
+    Each menu is a node number. Its adjacency is a pair of int/double
+    arrays, so strengths are exact products of the weights below. The ``max_related`` strongest menus within ``hops`` hops are
+    precomputed per node, so ``related`` is a dict lookup. Strength is the
+    product of edge weights along the best path; each hop expands only the
+    ``max_related`` best frontier nodes. Reloads derive a new graph that
+    recomputes only the lists of menus near a change.
+    """
+
+    def __init__(self, records: Iterable[SearchRecord] = (), hops: Optional[int] = None,
+                 max_related: Optional[int] = None, max_shared: Optional[int] = None):
+        self.hops = SEARCH_CONFIG["graph_hops"] if hops is None else hops
+        self.max_related = SEARCH_CONFIG["graph_max_related"] if max_related is None else max_related
+        self.max_shared = SEARCH_CONFIG["graph_max_shared"] if max_shared is None else max_shared
+        self._records: List[Optional[SearchRecord]] = []
+        # Tie-break of equally strong related menus, the same across rebuilds
+        self._ranks: List[Optional[Tuple[int, str]]] = []
+        self._node: Dict[Hashable, int] = {}
+        self._by_id: Dict[str, Set[int]] = {}
+        # Menu id -> {node listing it as a dependency: weight}
+        self._referrers: Dict[str, Dict[int, float]] = {}
+        self._by_previous: Dict[str, Set[int]] = {}
+        self._by_next: Dict[str, Set[int]] = {}
+        self._by_term: Dict[str, Set[int]] = {}
+        self._targets: List[array] = []
+        self._weights: List[array] = []
+        self._related: List[Tuple[array, array]] = []
+        self._owned: Set[int] = set()
+
+        nodes = [self._add(record) for record in records if record.active]
+        for node in nodes:
+            self._targets[node], self._weights[node] = self._packed(self._edges(node))
+        for node in nodes:
+            self._related[node] = self._compute_related(node)
+        del self._owned
+
+    def __len__(self) -> int:
+        return len(self._node)
+
+    # Index maintenance. Inner containers may be shared with the graph this
+    # one was derived from, so they are copied before their first mutation.
+
+    def _own(self, table: Dict, key, factory):
+        current = table.get(key)
+        if current is None or id(current) not in self._owned:
+            current = factory(current or ())
+            table[key] = current
+            self._owned.add(id(current))
+        return current
+
+    def _add(self, record: SearchRecord) -> int:
+        node = self._node.get(record.path)
+        if node is None:
+            node = len(self._records)
+            self._records.append(None)
+            self._ranks.append(None)
+            self._targets.append(array('i'))
+            self._weights.append(array('d'))
+            self._related.append(_NO_RELATED)
+            self._node[record.path] = node
+        self._records[node] = record
+        self._ranks[node] = (record.order, str(record.path))
+        self._own(self._by_id, record.id, set).add(node)
+        for menu_id in record.optional_menus:
+            referrers = self._own(self._referrers, menu_id, dict)
+            referrers[node] = max(referrers.get(node, 0.0), OPTIONAL_WEIGHT)
+        for menu_id in record.required_menus:
+            self._own(self._referrers, menu_id, dict)[node] = REQUIRED_WEIGHT
+        for state in record.previous_states:
+            self._own(self._by_previous, state, set).add(node)
+        for state in record.next_states:
+            self._own(self._by_next, state, set).add(node)
+        for term in record.related_terms:
+            self._own(self._by_term, term, set).add(node)
+        return node
+
+    def _discard(self, node: int) -> None:
+        record = self._records[node]
+        self._records[node] = None
+        self._ranks[node] = None
+
+        def drop(table: Dict, key, factory) -> None:
+            if key not in table:
+                return  # Listed twice by this record
+            members = self._own(table, key, factory)
+            if isinstance(members, dict):
+                members.pop(node, None)
+            else:
+                members.discard(node)
+            if not members:
+                del table[key]
+
+        drop(self._by_id, record.id, set)
+        for menu_id in record.required_menus + record.optional_menus:
+            drop(self._referrers, menu_id, dict)
+        for state in record.previous_states:
+            drop(self._by_previous, state, set)
+        for state in record.next_states:
+            drop(self._by_next, state, set)
+        for term in record.related_terms:
+            drop(self._by_term, term, set)
+
+    def _shared(self, state: str) -> bool:
+        """Whether a workflow state is rare enough to link the menus using it"""
+        return (len(self._by_previous.get(state, ())) <= self.max_shared
+                and len(self._by_next.get(state, ())) <= self.max_shared)
+
+    def _edges(self, node: int) -> Dict[int, float]:
+        """Neighbours of a node computed from the indexes; symmetric by construction"""
+        record = self._records[node]
+        edges: Dict[int, float] = {}
+
+        def link(others: Iterable[int], weight: float) -> None:
+            for other in others:
+                if other != node and edges.get(other, 0.0) < weight:
+                    edges[other] = weight
+
+        for menu_id in record.required_menus:
+            link(self._by_id.get(menu_id, ()), REQUIRED_WEIGHT)
+        for menu_id in record.optional_menus:
+            link(self._by_id.get(menu_id, ()), OPTIONAL_WEIGHT)
+        for other, weight in self._referrers.get(record.id, {}).items():
+            link((other,), weight)
+
+        for state in record.next_states:
+            if self._shared(state):
+                link(self._by_previous.get(state, ()), WORKFLOW_WEIGHT)
+            link(self._by_id.get(state, ()), WORKFLOW_WEIGHT)
+        for state in record.previous_states:
+            if self._shared(state):
+                link(self._by_next.get(state, ()), WORKFLOW_WEIGHT)
+            link(self._by_id.get(state, ()), WORKFLOW_WEIGHT)
+        link(self._by_previous.get(record.id, ()), WORKFLOW_WEIGHT)
+        link(self._by_next.get(record.id, ()), WORKFLOW_WEIGHT)
+
+        for term in record.related_terms:
+            members = self._by_term.get(term, ())
+            if len(members) <= self.max_shared:
+                link(members, RELATED_TERM_WEIGHT)
+        return edges
+
+    @staticmethod
+    def _packed(edges: Dict[int, float]) -> Tuple[array, array]:
+        targets = sorted(edges)
+        return array('i', targets), array('d', (edges[target] for target in targets))
+
+    def _strongest(self, strengths: Dict[int, float]) -> List[Tuple[float, Tuple[int, str], int]]:
+        """The max_related strongest nodes as (-strength, rank, node), best first"""
+        ranks = self._ranks
+        return heapq.nsmallest(self.max_related, (
+            (-strength, ranks[node], node) for node, strength in strengths.items()
+        ))
+
+    def _compute_related(self, node: int) -> Tuple[array, array]:
+        best = {node: 1.0}
+        frontier = [(1.0, node)]
+        for _ in range(self.hops):
+            reached: Dict[int, float] = {}
+            for strength, current in frontier:
+                for other, weight in zip(self._targets[current], self._weights[current]):
+                    candidate = strength * weight
+                    if candidate > best.get(other, 0.0):
+                        best[other] = reached[other] = candidate
+            if not reached:
+                break
+            if len(reached) <= self.max_related:
+                frontier = [(strength, other) for other, strength in reached.items()]
+            else:
+                frontier = [(-strength, other) for strength, _, other in self._strongest(reached)]
+        del best[node]
+        if not best:
+            return _NO_RELATED
+        top = self._strongest(best)
+        return (array('i', (other for _, _, other in top)),
+                array('d', (-strength for strength, _, _ in top)))
+
+    def _within(self, nodes: Set[int], hops: int) -> Set[int]:
+        """Nodes at most ``hops`` edges from any of nodes"""
+        seen = set(nodes)
+        frontier = nodes
+        for _ in range(hops):
+            frontier = {other for current in frontier for other in self._targets[current]} - seen
+            seen |= frontier
+        return seen
+
+    def updated(self, changed: Iterable[SearchRecord],
+                removed: Iterable[Hashable] = ()) -> 'MenuGraph':
+        """Return a new graph with changed menus re-linked and removed ones dropped.
+
+        Only the edges of changed menus, their neighbours and members of
+        workflow states or terms that crossed ``max_shared`` are recomputed,
+        and only related lists within reach of a changed edge; this graph
+        is left unmodified.
+        """
+        changed = list({record.path: record for record in changed}.values())
+        graph = MenuGraph.__new__(MenuGraph)
+        graph.hops, graph.max_related, graph.max_shared = self.hops, self.max_related, self.max_shared
+        graph._records = list(self._records)
+        graph._ranks = list(self._ranks)
+        graph._node = dict(self._node)
+        graph._by_id = dict(self._by_id)
+        graph._referrers = dict(self._referrers)
+        graph._by_previous = dict(self._by_previous)
+        graph._by_next = dict(self._by_next)
+        graph._by_term = dict(self._by_term)
+        graph._targets = list(self._targets)
+        graph._weights = list(self._weights)
+        graph._related = list(self._related)
+        graph._owned = set()
+
+        stale = {self._node[key] for key in removed if key in self._node}
+        stale.update(self._node[record.path] for record in changed if record.path in self._node)
+        live = [record for record in changed if record.active]
+        if len(self._records) + len(live) > 2 * (len(self._node) - len(stale) + len(live)) + 64:
+            # Mostly tombstones: renumber from scratch
+            keep = [record for record in self._records
+                    if record is not None and self._node[record.path] not in stale]
+            return MenuGraph(keep + live, self.hops, self.max_related, self.max_shared)
+
+        # Terms and states whose member count may cross max_shared with this update
+        terms, states = set(), set()
+        for record in [self._records[node] for node in stale] + live:
+            terms.update(record.related_terms)
+            states.update(record.previous_states + record.next_states)
+
+        def decisions() -> Dict[Tuple[bool, str], Tuple[bool, Set[int]]]:
+            """(is state, key) -> (links its members, members)"""
+            found = {}
+            for term in terms:
+                members = graph._by_term.get(term, set())
+                found[False, term] = (len(members) <= graph.max_shared, members)
+            for state in states:
+                members = graph._by_previous.get(state, set()) | graph._by_next.get(state, set())
+                found[True, state] = (graph._shared(state), members)
+            return found
+
+        before = decisions()
+        for node in stale:
+            graph._discard(node)
+        for key in removed:
+            node = graph._node.get(key)
+            if node is not None and graph._records[node] is None:
+                del graph._node[key]
+        for record in changed:
+            node = graph._node.get(record.path)
+            if not record.active and node is not None and graph._records[node] is None:
+                del graph._node[record.path]
+        fresh = {graph._add(record) for record in live}
+        after = decisions()
+
+        touched = stale | fresh
+        for key, (linked, members) in before.items():
+            if linked != after[key][0]:
+                touched |= members | after[key][1]
+
+        # Recompute edges of touched nodes, patching the mirror entry on their neighbours
+        rewired = set(touched)
+        for node in touched:
+            old_neighbours = set(graph._targets[node])
+            if graph._records[node] is None:
+                edges = {}
+            else:
+                edges = graph._edges(node)
+            graph._targets[node], graph._weights[node] = self._packed(edges)
+            for other in old_neighbours | set(edges):
+                if other in touched:
+                    continue
+                mirror = dict(zip(graph._targets[other], graph._weights[other]))
+                if other in edges:
+                    mirror[node] = edges[other]
+                else:
+                    mirror.pop(node, None)
+                graph._targets[other], graph._weights[other] = self._packed(mirror)
+                rewired.add(other)
+
+        # A related list reads the edges of nodes within hops - 1 of its own, in
+        # either graph, and the menu order of nodes within hops
+        reach = max(self.hops - 1, 0)
+        dirty = self._within({node for node in rewired if node < len(self._targets)}, reach)
+        dirty |= graph._within(rewired, reach)
+        reordered = {node for node in stale & fresh
+                     if self._records[node].order != graph._records[node].order}
+        dirty |= graph._within(reordered, self.hops)
+        for node in dirty:
+            if graph._records[node] is None:
+                graph._related[node] = _NO_RELATED
+            else:
+                graph._related[node] = graph._compute_related(node)
+        del graph._owned
+        return graph
+
+    def related_keys(self, key: Hashable) -> List[Tuple[float, Hashable]]:
+        """Precomputed (strength, key) pairs related to the menu stored at key"""
+        node = self._node.get(key)
+        if node is None:
+            return []
+        targets, strengths = self._related[node]
+        return [(strength, self._records[other].path) for other, strength in zip(targets, strengths)]
+
+    def related(self, menu_id: str, k: Optional[int] = None) -> List[Tuple[float, Hashable]]:
+        """Menus related to a menu id, strongest first, as (strength, key) pairs"""
+        nodes = self._by_id.get(menu_id)
+        if not nodes:
+            return []
+        node = min(nodes, key=lambda node: self._records[node].path)
+        return self.related_keys(self._records[node].path)[:k]
@@ -0,0 +1,80 @@
+# services/menu_refresher.py
+import threading
+from typing import Callable, List, Optional
+from utils.logger import get_logger
+
+logger = get_logger()
+
+class MenuRefresher:
+    """Daemon thread that periodically runs a refresh callback.
+
+    The callback builds and swaps in a new snapshot, so searches never wait
+    on disk I/O. ``trigger`` forces an early refresh and returns an event
+    that is set once that refresh has finished.
+    """
+
+    def __init__(self, refresh: Callable[[], None], interval: float,
+                 name: str = "menu-refresher"):
+        self._refresh = refresh
+        self.name = name
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._waiters: List[threading.Event] = []
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the refresher thread if it is not already running"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the refresher thread and wait for it to exit"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def trigger(self) -> threading.Event:
+        """Request a refresh now; the returned event is set when it completes"""
+        done = threading.Event()
+        with self._lock:
+            self._waiters.append(done)
+        self._wake.set()
+        return done
+
+    def refresh_now(self, timeout: Optional[float] = None) -> bool:
+        """Force a refresh and block until it finishes or timeout expires"""
+        return self.trigger().wait(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+
+            with self._lock:
+                waiters, self._waiters = self._waiters, []
+            try:
+                self._refresh()
+            except Exception as e:
+                logger.error(f"Background refresh ({self.name}) failed: {e}")
+            finally:
+                for done in waiters:
+                    done.set()
+
+        # Release anyone still waiting on a refresh that will never run
+        with self._lock:
+            waiters, self._waiters = self._waiters, []
+        for done in waiters:
+            done.set()
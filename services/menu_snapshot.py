@@ -0,0 +1,117 @@
+# services/menu_snapshot.py
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from models.search_record import SearchRecord
+from services.filter_index import FilterIndex
+from services.menu_graph import MenuGraph
+from services.search_index import SearchIndex
+from services.storage_service import FileSignature
+from services.suggestion_index import SuggestionIndex
+
+
+@dataclass(frozen=True)
+class MenuSnapshot:
+    """Immutable view of the loaded corpus and everything derived from it.
+
+    A new snapshot is built for every reload and swapped in with a single
+    reference assignment, so readers holding a snapshot always see records,
+    index and category maps from the same load.
+    """
+    records_by_path: Mapping[Path, SearchRecord] = field(default_factory=lambda: MappingProxyType({}))
+    index: SearchIndex = field(default_factory=SearchIndex)
+    suggestions: SuggestionIndex = field(default_factory=SuggestionIndex)
+    filters: FilterIndex = field(default_factory=FilterIndex)
+    graph: MenuGraph = field(default_factory=MenuGraph)
+    categories: Tuple[str, ...] = ()
+    records_by_category: Mapping[str, Tuple[SearchRecord, ...]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    # File signatures the records were loaded at, for the next incremental load
+    signatures: Mapping[Path, FileSignature] = field(default_factory=lambda: MappingProxyType({}))
+    version: int = 0
+    loaded_at: datetime = field(default_factory=datetime.utcnow)
+
+    def with_changes(self, updated: Iterable[SearchRecord], removed: Iterable[Path],
+                     signatures: Optional[Dict[Path, FileSignature]] = None) -> 'MenuSnapshot':
+        """Build the next snapshot by applying changed records to this one.
+
+        ``signatures`` replace this snapshot's file signatures when given.
+        """
+        updated = list(updated)
+        removed = list(removed)
+        records_by_path = dict(self.records_by_path)
+        for path in removed:
+            records_by_path.pop(path, None)
+        records_by_path.update((record.path, record) for record in updated)
+        return MenuSnapshot.from_parts(
+            records_by_path,
+            self.index.updated(updated, removed),
+            self.version + 1,
+            self.suggestions.updated(updated, removed),
+            self.filters.updated(updated, removed),
+            self.graph.updated(updated, removed),
+            self.signatures if signatures is None else signatures,
+        )
+
+    def with_search_hits(self, updated: Iterable[SearchRecord], version: int) -> 'MenuSnapshot':
+        """Build the next snapshot from records whose only change is their usage count.
+
+        Nothing is re-indexed: the index keeps its postings, and the filter
+        index and menu graph are shared. Only the suggestion ranking, which
+        orders by search_hits, is updated.
+        """
+        updated = list(updated)
+        records_by_path = dict(self.records_by_path)
+        records_by_path.update((record.path, record) for record in updated)
+        return MenuSnapshot.from_parts(
+            records_by_path,
+            self.index.with_search_hits(updated),
+            version,
+            self.suggestions.updated(updated),
+            self.filters,
+            self.graph,
+            self.signatures,
+        )
+
+    @classmethod
+    def from_parts(cls, records_by_path: Dict[Path, SearchRecord], index: SearchIndex,
+                   version: int,
+                   suggestions: Optional[SuggestionIndex] = None,
+                   filters: Optional[FilterIndex] = None,
+                   graph: Optional[MenuGraph] = None,
+                   signatures: Optional[Mapping[Path, FileSignature]] = None) -> 'MenuSnapshot':
+        """Build a snapshot around an existing index, deriving the category maps.
+
+        The suggestion and filter indexes and the menu graph are built from
+        the records unless given.
+        """
+        records_by_path = dict(sorted(records_by_path.items()))
+        if suggestions is None:
+            suggestions = SuggestionIndex(records_by_path.values())
+        if filters is None:
+            filters = FilterIndex(records_by_path.values())
+        if graph is None:
+            graph = MenuGraph(records_by_path.values())
+        records_by_category: Dict[str, List[SearchRecord]] = {}
+        for record in records_by_path.values():
+            if record.active:
+                records_by_category.setdefault(record.category, []).append(record)
+
+        return cls(
+            records_by_path=MappingProxyType(records_by_path),
+            index=index,
+            suggestions=suggestions,
+            filters=filters,
+            graph=graph,
+            signatures=MappingProxyType(dict(signatures or {})),
+            categories=tuple(sorted(set(
+                record.category for record in records_by_path.values()
+            ))),
+            records_by_category=MappingProxyType({
+                category: tuple(records) for category, records in records_by_category.items()
+            }),
+            version=version,
+        )
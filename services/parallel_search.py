@@ -0,0 +1,94 @@
+# services/parallel_search.py
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+from config.settings import DATA_DIR, SEARCH_CONFIG
+from services.search_service import SearchService
+from services.storage_service import StorageService
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# One SearchService per worker process, created by _init_worker
+_worker_service: Optional[SearchService] = None
+
+
+def _init_worker(data_dir: str) -> None:
+    """Load the corpus once per worker from the compiled snapshot"""
+    global _worker_service
+    _worker_service = SearchService(storage=StorageService(Path(data_dir)))
+
+
+def _rank_chunk(task: Tuple[List[str], int, int]) -> List[List[Tuple[float, str]]]:
+    queries, limit, offset = task
+    return [
+        [(score, record.id) for score, record in ranked]
+        for ranked in _worker_service.rank_many(queries, limit, offset)
+    ]
+
+
+class ParallelSearchRunner:
+    """Process-pool execution of bulk lexical search workloads.
+
+    Scoring is pure Python and bound by the GIL, so bulk replays are
+    spread over worker processes. Before starting the pool the compiled
+    corpus snapshot is refreshed if needed; every worker then decodes that
+    file instead of re-parsing data/menus. Decoding builds ordinary Python
+    objects, so each worker holds a private copy of the corpus and index;
+    budget memory per worker. Results come back in input order as
+    (score, menu id) lists, ranked exactly like ``SearchService.search``.
+    """
+
+    def __init__(self, data_dir: Path = DATA_DIR, workers: Optional[int] = None,
+                 chunk_size: Optional[int] = None):
+        self.data_dir = data_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or SEARCH_CONFIG["batch_size"]
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'ParallelSearchRunner':
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Make sure the compiled snapshot is current, then start the workers"""
+        if self._executor is not None:
+            return
+        service = SearchService(storage=StorageService(self.data_dir))
+        if not service.compiled_snapshot_current:
+            size = service.compile_snapshot()
+            logger.info(f"Recompiled menu snapshot for worker processes ({size} bytes)")
+        del service
+
+        # Spawned workers never inherit the parent's threads or locks
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(self.data_dir),),
+        )
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def search_many(self, queries: Sequence[str], limit: Optional[int] = None,
+                    offset: int = 0) -> List[List[Tuple[float, str]]]:
+        """Rank every query across the worker pool, preserving input order"""
+        self.start()
+        if limit is None:
+            limit = SEARCH_CONFIG["max_results"]
+        tasks = [
+            (list(queries[start:start + self.chunk_size]), limit, offset)
+            for start in range(0, len(queries), self.chunk_size)
+        ]
+        results: List[List[Tuple[float, str]]] = []
+        for chunk in self._executor.map(_rank_chunk, tasks):
+            results.extend(chunk)
+        return results
@@ -0,0 +1,65 @@
+# services/phrase_matcher.py
+from collections import deque
+from typing import Dict, List, Sequence, Set
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton reporting which patterns occur in a text.
+
+    Built once over every keyword and search phrase of the corpus, so a
+    query is scanned a single time no matter how many phrases exist.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        # The empty pattern is a substring of every text
+        self._always: List[int] = []
+
+        for pattern_id, pattern in enumerate(patterns):
+            if not pattern:
+                self._always.append(pattern_id)
+                continue
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = next_state
+            self._out[state].append(pattern_id)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        """Breadth-first pass linking each state to its longest proper suffix"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(ch, 0)
+                self._fail[next_state] = fail
+                # Inherit matches ending at the suffix state
+                if self._out[fail]:
+                    self._out[next_state] = self._out[next_state] + self._out[fail]
+
+    def find(self, text: str) -> Set[int]:
+        """Return the ids of all patterns occurring in text"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(self._always)
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
@@ -0,0 +1,39 @@
+# services/score_fusion.py
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+Ranking = Sequence[Tuple[float, Hashable]]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Ranking], k: int = 60) -> Dict[Hashable, float]:
+    """Fuse rankings by summing 1 / (k + rank) over every list a key appears in"""
+    fused: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, (_, key) in enumerate(ranking, start=1):
+            fused[key] = fused.get(key, 0.0) + 1.0 / (k + rank)
+    return fused
+
+
+def weighted_fusion(lexical: Ranking, semantic: Ranking,
+                    semantic_weight: float) -> Dict[Hashable, float]:
+    """Blend max-normalized lexical scores with cosine similarities"""
+    fused: Dict[Hashable, float] = {}
+    top = max((score for score, _ in lexical), default=0.0)
+    if top > 0:
+        for score, key in lexical:
+            fused[key] = (1.0 - semantic_weight) * score / top
+    for similarity, key in semantic:
+        fused[key] = fused.get(key, 0.0) + semantic_weight * max(similarity, 0.0)
+    return fused
+
+
+def lexical_is_decisive(lexical: Ranking, min_score: float, min_margin: float) -> bool:
+    """True when the best lexical match clearly beats the runner-up"""
+    if not lexical or lexical[0][0] < min_score:
+        return False
+    return len(lexical) == 1 or lexical[0][0] - lexical[1][0] >= min_margin
+
+
+def rank(fused: Dict[Hashable, float], order_of, k: int) -> List[Tuple[float, Hashable]]:
+    """Sort fused scores best first, breaking ties on menu order then key"""
+    ranked = sorted(fused, key=lambda key: (-fused[key], order_of(key), key))
+    return [(fused[key], key) for key in ranked[:k]]
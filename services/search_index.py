@@ -0,0 +1,270 @@
+# services/search_index.py
+import copy
+import heapq
+from bisect import bisect_right
+from typing import AbstractSet, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from models.search_record import DESCRIPTION_SLOT, NAME_SLOT, SearchRecord
+from config.settings import SEARCH_CONFIG
+from services.fuzzy_matcher import FuzzyMatcher
+from services.phrase_matcher import PhraseMatcher
+from utils.metrics import get_metrics
+
+metrics = get_metrics()
+
+# Separator for the concatenated name/description haystacks
+_SEPARATOR = "\x00"
+
+Posting = Tuple[Hashable, int]
+
+
+class SearchIndex:
+    """Inverted index mapping lowercased menu terms to scoring slots.
+
+    Token postings cover the enhancer terms, an Aho-Corasick automaton over
+    keywords and search phrases finds every phrase in one pass over the
+    query, and the direct name/description checks run against one
+    concatenated haystack. A query therefore only touches menus that match
+    at least one of them, and produces the same scores as the linear scan
+    it replaced (benchmarks/legacy_scoring.py).
+    """
+
+    def __init__(self, records: Iterable[SearchRecord] = ()):
+        self._docs: Dict[Hashable, SearchRecord] = {}
+        self._postings: Dict[str, List[Posting]] = {}
+        self._patterns: Dict[str, List[Posting]] = {}
+        self._batch_scorer = None
+        self._fuzzy_matcher = None
+        for record in records:
+            if record.active:
+                self._add(record)
+        self._build_haystacks()
+        self._build_phrase_matcher()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Rebuilt on demand rather than persisted
+        state['_batch_scorer'] = None
+        state['_fuzzy_matcher'] = None
+        return state
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._docs
+
+    def get(self, key: Hashable) -> Optional[SearchRecord]:
+        return self._docs.get(key)
+
+    def records(self) -> List[SearchRecord]:
+        """All indexed (active) records in index order"""
+        return list(self._docs.values())
+
+    @property
+    def fuzzy_matcher(self) -> FuzzyMatcher:
+        """Typo-tolerant lookup over every record's vocabulary, built on first use"""
+        if self._fuzzy_matcher is None:
+            self._fuzzy_matcher = FuzzyMatcher(
+                (word for record in self._docs.values() for word in record.vocabulary),
+                max_distance=SEARCH_CONFIG["fuzzy_max_distance"],
+                min_length=SEARCH_CONFIG["fuzzy_min_length"],
+            )
+        return self._fuzzy_matcher
+
+    @property
+    def batch_scorer(self) -> 'BatchScorer':
+        """Matrix form of this index for scoring many queries at once, built on first use"""
+        if self._batch_scorer is None:
+            from services.batch_scorer import BatchScorer
+            self._batch_scorer = BatchScorer(self)
+        return self._batch_scorer
+
+    def _add(self, doc: SearchRecord) -> None:
+        """Register a menu's triggers in the posting lists"""
+        self._docs[doc.path] = doc
+        for token, slot in doc.token_triggers:
+            self._postings.setdefault(token, []).append((doc.path, slot))
+        for pattern, slot in doc.substring_triggers:
+            self._patterns.setdefault(pattern, []).append((doc.path, slot))
+
+    def updated(self, changed: Iterable[SearchRecord],
+                removed: Iterable[Hashable] = ()) -> 'SearchIndex':
+        """Return a new index with changed menus re-indexed and removed ones dropped.
+
+        Only the posting lists touched by those menus are copied, the rest
+        are shared with this index, which is left unmodified. The phrase
+        automaton is rebuilt only when a phrase it does not know appears.
+        """
+        changed = list(changed)
+        stale = {key for key in removed if key in self._docs}
+        stale.update(record.path for record in changed if record.path in self._docs)
+        fresh = [record for record in changed if record.active]
+
+        index = copy.copy(self)
+        index._batch_scorer = None
+        index._fuzzy_matcher = None
+        index._docs = dict(self._docs)
+        index._postings = dict(self._postings)
+        index._patterns = dict(self._patterns)
+
+        old_docs = [index._docs.pop(key) for key in stale]
+        for table, attr in ((index._postings, 'token_triggers'),
+                            (index._patterns, 'substring_triggers')):
+            affected = {term for doc in old_docs for term, _ in getattr(doc, attr)}
+            for term in affected:
+                postings = [p for p in table[term] if p[0] not in stale]
+                if postings:
+                    table[term] = postings
+                else:
+                    del table[term]
+            # Copy the lists the new menus append to, so this index stays intact
+            for term in {term for doc in fresh for term, _ in getattr(doc, attr)}:
+                if term in table and term not in affected:
+                    table[term] = list(table[term])
+
+        new_phrases = False
+        for doc in fresh:
+            index._add(doc)
+            new_phrases = new_phrases or any(
+                pattern not in self._known_patterns for pattern, _ in doc.substring_triggers
+            )
+
+        index._build_haystacks()
+        if new_phrases:
+            index._build_phrase_matcher()
+        return index
+
+    def with_search_hits(self, records: Iterable[SearchRecord]) -> 'SearchIndex':
+        """Return a new index holding records whose usage counts changed.
+
+        Usage counts never change what a record matches, so the postings,
+        haystacks, automaton, fuzzy matcher and batch matrices are shared
+        with this index, which is left unmodified.
+        """
+        index = copy.copy(self)
+        index._docs = dict(self._docs)
+        for record in records:
+            if record.path in index._docs:
+                index._docs[record.path] = record
+        if self._batch_scorer is not None:
+            index._batch_scorer = self._batch_scorer.with_index(index)
+        return index
+
+    def _build_haystacks(self) -> None:
+        """Concatenate names and descriptions for single-pass direct matching"""
+        self._haystack_keys = list(self._docs)
+        self._name_haystack, self._name_starts = self._join(
+            self._docs[key].name for key in self._haystack_keys
+        )
+        self._description_haystack, self._description_starts = self._join(
+            self._docs[key].description for key in self._haystack_keys
+        )
+
+    def _build_phrase_matcher(self) -> None:
+        """Compile all distinct phrases into one automaton"""
+        self._pattern_by_id = list(self._patterns)
+        self._known_patterns = set(self._pattern_by_id)
+        self._phrase_matcher = PhraseMatcher(self._pattern_by_id)
+
+    @staticmethod
+    def _join(texts: Iterable[str]) -> Tuple[str, List[int]]:
+        starts = []
+        parts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            parts.append(text)
+            offset += len(text) + 1
+        return _SEPARATOR.join(parts), starts
+
+    def _direct_matches(self, query: str, haystack: str, starts: List[int],
+                        attr: str) -> List[Hashable]:
+        """Return keys of menus whose text contains the query"""
+        keys = self._haystack_keys
+        if not query or _SEPARATOR in query:
+            return [key for key in keys if query in getattr(self._docs[key], attr)]
+
+        matches = []
+        pos = haystack.find(query)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            matches.append(keys[i])
+            if i + 1 >= len(starts):
+                break
+            pos = haystack.find(query, starts[i + 1])
+        return matches
+
+    def match_slots(self, query: str, query_tokens: Set[str]) -> Dict[Hashable, Set[int]]:
+        """Collect the matched scoring slots of every candidate menu"""
+        matched = self.match_text_slots(query)
+        with metrics.stage("index.token_matches"):
+            for token in query_tokens:
+                for key, slot in self._postings.get(token, ()):
+                    matched.setdefault(key, set()).add(slot)
+        return matched
+
+    def match_text_slots(self, query: str) -> Dict[Hashable, Set[int]]:
+        """Collect slots matched by substring: name, description and phrases"""
+        matched: Dict[Hashable, Set[int]] = {}
+
+        with metrics.stage("index.name_matches"):
+            for key in self._direct_matches(query, self._name_haystack,
+                                            self._name_starts, 'name'):
+                matched.setdefault(key, set()).add(NAME_SLOT)
+        with metrics.stage("index.description_matches"):
+            for key in self._direct_matches(query, self._description_haystack,
+                                            self._description_starts, 'description'):
+                matched.setdefault(key, set()).add(DESCRIPTION_SLOT)
+
+        with metrics.stage("index.phrase_matches"):
+            for pattern_id in self._phrase_matcher.find(query):
+                # Phrases of removed menus stay in the automaton until it is rebuilt
+                for key, slot in self._patterns.get(self._pattern_by_id[pattern_id], ()):
+                    matched.setdefault(key, set()).add(slot)
+
+        return matched
+
+    def score(self, query: str, query_tokens: Set[str]) -> Dict[Hashable, float]:
+        """Score all candidate menus for an already lowercased query"""
+        scores = {}
+        for key, slots in self.match_slots(query, query_tokens).items():
+            score = self._docs[key].score(slots)
+            if score > 0:
+                scores[key] = score
+        return scores
+
+    def top_k(self, query: str, query_tokens: Set[str], k: int,
+              corrected_query: Optional[str] = None,
+              popularity_weight: float = 0.0,
+              allowed: Optional[AbstractSet[Hashable]] = None) -> List[Tuple[float, Hashable]]:
+        """Return the k best (score, key) pairs, best first.
+
+        Ranking is by score, then menu order, then key. A heap keeps only
+        the k best of the scored candidates. A spelling-corrected query, if
+        given, adds its substring matches to those of the original. A
+        non-zero popularity_weight adds ``SearchRecord.popularity`` to the
+        score of every matching menu. When ``allowed`` is given, only those
+        keys are scored (see ``FilterIndex.allowed``).
+        """
+        if k <= 0:
+            return []
+        docs = self._docs
+        matched = self.match_slots(query, query_tokens)
+        if corrected_query is not None:
+            for key, slots in self.match_text_slots(corrected_query).items():
+                matched.setdefault(key, set()).update(slots)
+        if allowed is not None:
+            matched = {key: slots for key, slots in matched.items() if key in allowed}
+
+        metrics.increment("index.candidates", len(matched))
+
+        with metrics.stage("index.score"):
+            scored = [
+                (-(score + docs[key].popularity(popularity_weight)), docs[key].order, key)
+                for score, key in ((docs[key].score(slots), key)
+                                   for key, slots in matched.items())
+                if score > 0
+            ]
+        with metrics.stage("index.rank"):
+            ranked = heapq.nsmallest(k, scored)
+        return [(-neg_score, key) for neg_score, _, key in ranked]
@@ -0,0 +1,357 @@
+# services/search_server.py
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit
+from config.settings import SEARCH_CONFIG
+from models.menu import MenuItem
+from services.filter_index import SearchFilters
+from services.search_service import SearchService
+from utils.logger import get_logger
+from utils.metrics import LatencyHistogram, get_metrics
+
+logger = get_logger()
+
+MAX_HEADER_BYTES = 16 * 1024
+
+
+class HTTPError(Exception):
+    """Raised by route handlers to answer with a non-200 status"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _menu_summary(menu: MenuItem) -> Dict[str, Any]:
+    return {
+        "id": menu.id,
+        "name": menu.name,
+        "description": menu.description,
+        "url": menu.url,
+        "category": menu.menu_details.category,
+        "subcategory": menu.menu_details.subcategory,
+    }
+
+
+def _int_param(params: Dict[str, str], name: str, default: Optional[int]) -> Optional[int]:
+    value = params.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{name}' must be a non-negative integer")
+    return number
+
+
+def _float_param(params: Dict[str, str], name: str) -> Optional[float]:
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        number = -1.0
+    if not 0 <= number < float("inf"):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{name}' must be a non-negative number")
+    return number
+
+
+def _filters_param(params: Dict[str, str]) -> Optional[SearchFilters]:
+    """Filters from category/subcategory/context and comma-separated permissions"""
+    permissions = params.get("permissions")
+    filters = SearchFilters(
+        category=params.get("category"),
+        subcategory=params.get("subcategory"),
+        context=params.get("context"),
+        permissions=None if permissions is None else [
+            role.strip() for role in permissions.split(",") if role.strip()
+        ],
+    )
+    return filters if filters.active else None
+
+
+class SearchServer:
+    """Long-running asyncio HTTP front-end for one shared SearchService.
+
+    The corpus is loaded once and refreshed in the background; every
+    request reads the service's current snapshot. Scoring runs on a
+    thread pool so the event loop keeps accepting connections while
+    queries are ranked. Routes (all GET, JSON responses):
+
+        /search?q=&limit=&offset=&mode=   ranked menus; q is required
+        /suggest?q=&k=                    as-you-type suggestions
+        /categories                       category names
+        /categories/<name>/menus          active menus in a category
+        /menus/<id>/related?k=            menus linked by dependencies and workflow
+        /stats                            latency percentiles and cache stats
+        /metrics                          stage timings in Prometheus text format
+
+    /search and the category routes also take category=, subcategory=,
+    context= and permissions=<role,role> filters; /search also takes
+    related_weight= to boost menus related to its results.
+    """
+
+    def __init__(self, service: Optional[SearchService] = None, host: str = "127.0.0.1",
+                 port: int = 8080, workers: Optional[int] = None):
+        self.service = service or SearchService(background_refresh=True, usage_metrics=True)
+        self.host = host
+        self.port = port
+        self.workers = workers or SEARCH_CONFIG["server_workers"]
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._latency: Dict[str, LatencyHistogram] = {}
+
+    async def __aenter__(self) -> 'SearchServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Bind the listening socket; port 0 picks a free port, stored in self.port"""
+        if self._server is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix="search-worker")
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Search server listening on http://{self.host}:{self.port}")
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-route request counts and p50/p95/p99 latencies in milliseconds"""
+        return {route: histogram.summary() for route, histogram in sorted(self._latency.items())}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, keep_alive = request
+                status, payload = await self.dispatch(method, target)
+                if isinstance(payload, str):
+                    body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+                else:
+                    body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    .encode("latin-1") + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass  # Client went away or sent garbage; nothing to answer
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, bool]]:
+        """Read one request head; returns (method, target, keep_alive) or None at EOF"""
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            return None
+
+        headers: Dict[str, str] = {}
+        size = len(request_line)
+        while True:
+            line = await reader.readline()
+            size += len(line)
+            if size > MAX_HEADER_BYTES:
+                return None
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        # Request bodies are not used by any route, but must not be parsed as a request
+        length = int(headers.get("content-length", "0") or 0)
+        if length:
+            await reader.readexactly(length)
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method, target, keep_alive
+
+    async def dispatch(self, method: str, target: str) -> Tuple[HTTPStatus, Any]:
+        """Route one request and return (status, JSON-serializable payload)"""
+        started = time.perf_counter()
+        url = urlsplit(target)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        route = "<unmatched>"  # Keeps arbitrary paths from each getting a histogram
+        try:
+            if method != "GET":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not supported")
+            route, handler, args = self._route(url.path, params)
+            payload = await self._run(handler, *args)
+            status = HTTPStatus.OK
+        except HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:
+            logger.error(f"Error handling {method} {target}: {e}")
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+
+        self._latency.setdefault(route, LatencyHistogram()).record(
+            (time.perf_counter() - started) * 1000
+        )
+        return status, payload
+
+    def _route(self, path: str, params: Dict[str, str]):
+        """Resolve a path to (route name for metrics, handler, handler args)"""
+        if path == "/search":
+            return path, self._search, (params,)
+        if path == "/suggest":
+            return path, self._suggest, (params,)
+        if path == "/categories":
+            return path, self.service.get_categories, (_filters_param(params),)
+        if path.startswith("/categories/") and path.endswith("/menus"):
+            category = unquote(path[len("/categories/"):-len("/menus")])
+            return "/categories/{category}/menus", self._menus_by_category, (
+                category, _filters_param(params),
+            )
+        if path.startswith("/menus/") and path.endswith("/related"):
+            menu_id = unquote(path[len("/menus/"):-len("/related")])
+            return "/menus/{id}/related", self._related, (menu_id, _int_param(params, "k", None))
+        if path == "/stats":
+            return path, self._stats, ()
+        if path == "/metrics":
+            return path, get_metrics().render_prometheus, ()
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+
+    async def _run(self, handler, *args):
+        """Run a blocking handler on the worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, handler, *args)
+
+    def _search(self, params: Dict[str, str]) -> Dict[str, Any]:
+        query = params.get("q", "")
+        if not query.strip():
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'q' is required")
+        try:
+            response = self.service.search_detailed(
+                query,
+                limit=_int_param(params, "limit", None),
+                offset=_int_param(params, "offset", 0),
+                mode=params.get("mode", "lexical"),
+                filters=_filters_param(params),
+                related_weight=_float_param(params, "related_weight"),
+            )
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        return {
+            "query": query,
+            "mode": response.mode,
+            "semantic_used": response.semantic_used,
+            "degraded": response.degraded,
+            "cached": response.cached,
+            "elapsed_ms": response.elapsed_ms,
+            "results": [
+                {"score": score, "menu": _menu_summary(menu)} for score, menu in response.results
+            ],
+        }
+
+    def _suggest(self, params: Dict[str, str]) -> Dict[str, Any]:
+        prefix = params.get("q", "")
+        suggestions = self.service.suggest(prefix, _int_param(params, "k", None))
+        return {
+            "prefix": prefix,
+            "suggestions": [
+                {"text": suggestion.text, "menu_id": suggestion.menu_id}
+                for suggestion in suggestions
+            ],
+        }
+
+    def _menus_by_category(self, category: str,
+                           filters: Optional[SearchFilters]) -> Dict[str, Any]:
+        menus = self.service.get_menus_by_category(category, filters)
+        return {
+            "category": category,
+            "menus": [_menu_summary(menu) for menu in menus],
+        }
+
+    def _related(self, menu_id: str, k: Optional[int]) -> Dict[str, Any]:
+        related = self.service.related(menu_id, k)
+        return {
+            "menu_id": menu_id,
+            "related": [
+                {"strength": strength, "menu": _menu_summary(menu)} for strength, menu in related
+            ],
+        }
+
+    def _stats(self) -> Dict[str, Any]:
+        return {
+            "menus": len(self.service.snapshot.index),
+            "snapshot_version": self.service.snapshot.version,
+            "latency_ms": self.latency_stats(),
+            "query_cache": self.service.cache_stats(),
+            "instrumentation": get_metrics().snapshot(),
+        }
+
+
+class SearchClient:
+    """Minimal asyncio HTTP client for a SearchServer, e.g. one started in-process.
+
+    ``async with SearchServer(service, port=0) as server:`` followed by
+    ``SearchClient(server.host, server.port)`` exercises the full HTTP
+    path without any external tooling.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080):
+        self.host = host
+        self.port = port
+
+    async def get(self, path: str, **params: Any) -> Tuple[int, Any]:
+        """Issue one GET request; returns (status code, decoded JSON or text body)"""
+        target = f"{path}?{urlencode(params)}" if params else path
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(
+                f"GET {target} HTTP/1.1\r\nHost: {self.host}\r\nConnection: close\r\n\r\n"
+                .encode("latin-1")
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            status = int(status_line.split()[1])
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+        finally:
+            writer.close()
+        if headers.get("content-type", "").startswith("application/json"):
+            return status, json.loads(body)
+        return status, body.decode("utf-8")
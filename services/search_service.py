@@ -1,121 +1,668 @@
 # services/search_service.py
-from typing import List, Tuple, Set
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import AbstractSet, Dict, Hashable, List, Optional, Sequence, Tuple, Set
+from config.settings import SEARCH_CONFIG
 from models.menu import MenuItem
+from models.search_record import SearchRecord
+from services.corpus_snapshot import (
+    CompiledCorpus, read_compiled_snapshot, write_compiled_snapshot
+)
+from services.filter_index import SearchFilters
+from services.menu_refresher import MenuRefresher
+from services.menu_snapshot import MenuSnapshot
+from services.score_fusion import (
+    lexical_is_decisive, rank, reciprocal_rank_fusion, weighted_fusion
+)
+from services.semantic_engine import SemanticSearchEngine
 from services.storage_service import StorageService
+from services.suggestion_index import Suggestion
+from services.usage_metrics import UsageMetricsAggregator
 from utils.logger import get_logger
+from utils.lru_cache import LRUCache
+from utils.metrics import get_metrics
+from utils.text_pipeline import get_pipeline
 from datetime import datetime
 
 logger = get_logger()
+metrics = get_metrics()
+
+SEARCH_MODES = ("lexical", "semantic", "hybrid")
+
+@dataclass
+class SearchResponse:
+    """Search results plus metadata about how they were produced"""
+    results: List[Tuple[float, MenuItem]]
+    mode: str
+    semantic_used: bool = False
+    degraded: bool = False  # Hybrid fell back to lexical-only (budget or error)
+    cached: bool = False
+    elapsed_ms: float = 0.0
 
 class SearchService:
-    def __init__(self):
-        self.storage = StorageService()
-        self._menus: List[MenuItem] = []
-        self._load_menus()
-        self._last_reload = datetime.utcnow()
+    def __init__(self, storage: Optional[StorageService] = None,
+                 background_refresh: bool = False, use_compiled: bool = True,
+                 semantic: Optional[bool] = None,
+                 semantic_engine: Optional[SemanticSearchEngine] = None,
+                 fuzzy: Optional[bool] = None,
+                 usage_metrics: Optional[bool] = None,
+                 normalization: Optional[str] = None):
+        self.storage = storage or StorageService()
+        # Menus and queries must go through the same pipeline
+        self.pipeline = get_pipeline(normalization)
+        if SEARCH_CONFIG["instrumentation"]:
+            metrics.enable()
+        self.fuzzy = SEARCH_CONFIG["fuzzy_matching"] if fuzzy is None else fuzzy
+        if usage_metrics is None:
+            usage_metrics = SEARCH_CONFIG["usage_metrics"]
+        self._usage: Optional[UsageMetricsAggregator] = None
+        if usage_metrics:
+            self._usage = UsageMetricsAggregator(self.storage.usage_metrics_path,
+                                                 SEARCH_CONFIG["usage_flush_interval"])
+            self._usage.start()
+        if semantic is None:
+            semantic = SEARCH_CONFIG["semantic_search"]
+        if semantic_engine is None and semantic:
+            semantic_engine = SemanticSearchEngine(self.storage.data_dir / "semantic")
+        self._semantic = semantic_engine
+        self._semantic_pool: Optional[ThreadPoolExecutor] = None
+        self._semantic_pool_lock = threading.Lock()
+        self._semantic_in_flight = 0
+        self._snapshot = MenuSnapshot()
+        # Full MenuItems are only kept for recently displayed results
+        self._menu_cache = LRUCache(SEARCH_CONFIG["menu_cache_size"])
+        self._query_cache = LRUCache(SEARCH_CONFIG["cache_size"], SEARCH_CONFIG["cache_ttl"])
+        self._reload_lock = threading.Lock()
         self.reload_interval = 300  # Reload menus every 5 minutes
+        self._compiled_version: Optional[int] = None
+        if use_compiled and self._load_compiled_snapshot():
+            self._sync_missing_embeddings()
+        self._load_menus()  # Picks up files changed since the snapshot was compiled
+        self._prune_embeddings()
+        self._last_reload = datetime.utcnow()
+        self._refresher: Optional[MenuRefresher] = None
+        if background_refresh:
+            self.start_background_refresh()
+
+    @property
+    def snapshot(self) -> MenuSnapshot:
+        """The current immutable menu snapshot"""
+        return self._snapshot
+
+    def _load_compiled_snapshot(self) -> bool:
+        """Start from the compiled corpus snapshot, if one exists for this directory"""
+        compiled = read_compiled_snapshot(self.storage.compiled_snapshot_path)
+        if compiled is None:
+            return False
+        if compiled.menus_dir != str(self.storage.menus_dir):
+            logger.warning(f"Ignoring menu snapshot compiled for {compiled.menus_dir}")
+            return False
+        if compiled.normalization != self.pipeline.name:
+            logger.warning(f"Ignoring menu snapshot normalized with '{compiled.normalization}'")
+            return False
+
+        self._snapshot = MenuSnapshot.from_parts(compiled.records_by_path, compiled.index, 1,
+                                                 signatures=compiled.signatures)
+        self._compiled_version = self._snapshot.version
+        self._query_cache.clear()
+        logger.info(
+            f"Loaded {len(compiled.records_by_path)} menus from snapshot "
+            f"compiled at {compiled.created_at.isoformat()}"
+        )
+        return True
+
+    @property
+    def compiled_snapshot_current(self) -> bool:
+        """True when the compiled snapshot on disk matches the loaded corpus"""
+        return self._compiled_version == self._snapshot.version
+
+    def compile_snapshot(self, path: Optional[Path] = None) -> int:
+        """Write the loaded corpus and index to a compiled snapshot; returns its size"""
+        with self._reload_lock:
+            snapshot = self._snapshot
+            size = write_compiled_snapshot(path or self.storage.compiled_snapshot_path, CompiledCorpus(
+                menus_dir=str(self.storage.menus_dir),
+                signatures=dict(snapshot.signatures),
+                records_by_path=dict(snapshot.records_by_path),
+                index=snapshot.index,
+                created_at=datetime.utcnow(),
+                normalization=self.pipeline.name,
+            ))
+            if path is None:
+                self._compiled_version = snapshot.version
+        return size
 
     def _load_menus(self) -> None:
-        """Load all menus from storage"""
+        """Load new and changed menus from storage and swap in a new snapshot"""
+        with self._reload_lock, metrics.stage("reload.total"):
+            try:
+                with metrics.stage("reload.scan"):
+                    changes = self.storage.load_changed_menus(dict(self._snapshot.signatures))
+            except Exception as e:
+                logger.error(f"Failed to load menus: {e}")
+                raise Exception(f"Failed to load menus: {e}")
+
+            with metrics.stage("reload.usage"):
+                usage = self._usage.totals() if self._usage is not None else {}
+
+            records = []
+            with metrics.stage("reload.records"):
+                for path, menu in changes.updated.items():
+                    record = SearchRecord(path, menu, self.pipeline)
+                    if record.id in usage:
+                        record.search_hits += usage[record.id].search_hits
+                    self._menu_cache.put(record, menu)
+                    records.append(record)
+
+                # Fold usage counted since the last reload into unchanged menus
+                removed = set(changes.removed)
+                popular = []
+                for path, record in self._snapshot.records_by_path.items():
+                    if path in changes.updated or path in removed or record.id not in usage:
+                        continue
+                    search_hits = record.stored_search_hits + usage[record.id].search_hits
+                    if search_hits != record.search_hits:
+                        popular.append(record.with_search_hits(search_hits))
+
+            files_changed = bool(records or changes.removed)
+            if not files_changed and not popular:
+                return
+
+            snapshot = self._snapshot
+            if files_changed:
+                with metrics.stage("reload.embeddings"):
+                    self._sync_embeddings(changes.updated, changes.removed)
+                with metrics.stage("reload.index"):
+                    snapshot = snapshot.with_changes(records, changes.removed, changes.signatures)
+            if popular:
+                # Counts reorder suggestions, but search results only through popularity_weight
+                version = snapshot.version
+                if SEARCH_CONFIG["popularity_weight"] and not files_changed:
+                    version += 1
+                with metrics.stage("reload.usage_counts"):
+                    snapshot = snapshot.with_search_hits(popular, version)
+            if self.fuzzy:
+                with metrics.stage("reload.fuzzy"):
+                    snapshot.index.fuzzy_matcher  # Build before readers can see the snapshot
+            if snapshot.version != self._snapshot.version:
+                self._query_cache.clear()
+            self._snapshot = snapshot  # Atomic swap; readers keep their old reference
+            metrics.increment("reload.menus_updated", len(changes.updated))
+            metrics.increment("reload.menus_removed", len(changes.removed))
+            logger.info(
+                f"Loaded {len(snapshot.records_by_path)} menus "
+                f"({len(changes.updated)} updated, {len(changes.removed)} removed, "
+                f"{len(popular)} usage counts updated)"
+            )
+
+    def _sync_embeddings(self, updated: Dict[Path, MenuItem], removed: List[Path]) -> None:
+        """Update the semantic index; failures leave lexical search untouched"""
+        if self._semantic is None:
+            return
         try:
-            self._menus = self.storage.load_menus()
-            logger.info(f"Loaded {len(self._menus)} menus")
+            encoded = self._semantic.sync(updated, removed)
+            if encoded:
+                logger.info(f"Embedded {encoded} menus for semantic search")
         except Exception as e:
-            logger.error(f"Failed to load menus: {e}")
-            raise Exception(f"Failed to load menus: {e}")
+            logger.error(f"Failed to update semantic index: {e}")
+
+    def _sync_missing_embeddings(self) -> None:
+        """Embed compiled-snapshot menus that the persisted semantic index lacks"""
+        if self._semantic is None:
+            return
+        missing = self._semantic.missing(
+            path for path, record in self._snapshot.records_by_path.items() if record.active
+        )
+        menus = {}
+        for path in missing:
+            try:
+                menus[path] = self.storage.load_menu_file(path)
+            except Exception:
+                continue  # Logged by storage; the next reload reports it as removed
+        self._sync_embeddings(menus, [])
+
+    def _prune_embeddings(self) -> None:
+        """Drop persisted embeddings of menus deleted while the service was down"""
+        if self._semantic is None:
+            return
+        try:
+            dropped = self._semantic.prune(
+                path for path, record in self._snapshot.records_by_path.items() if record.active
+            )
+            if dropped:
+                logger.info(f"Dropped {dropped} embeddings of menus no longer in the corpus")
+        except Exception as e:
+            logger.error(f"Failed to prune semantic index: {e}")
 
     def _check_reload(self) -> None:
         """Check if menus need to be reloaded"""
+        if self._refresher is not None and self._refresher.running:
+            return  # The background refresher keeps the snapshot fresh
         now = datetime.utcnow()
         if (now - self._last_reload).total_seconds() > self.reload_interval:
             self._load_menus()
             self._last_reload = now
 
+    def start_background_refresh(self, interval: Optional[float] = None) -> MenuRefresher:
+        """Reload menus on a background thread instead of inside requests"""
+        if self._refresher is None:
+            self._refresher = MenuRefresher(self._load_menus, interval or self.reload_interval)
+        elif interval:
+            self._refresher.interval = interval
+        self._refresher.start()
+        return self._refresher
+
+    def stop_background_refresh(self, timeout: Optional[float] = None) -> None:
+        """Stop the background refresher; reloads happen inline again"""
+        if self._refresher is not None:
+            self._refresher.stop(timeout)
+            self._last_reload = datetime.utcnow()
+
+    def refresh(self, timeout: Optional[float] = None) -> bool:
+        """Force a reload now and wait for the new snapshot to be swapped in"""
+        if self._refresher is not None and self._refresher.running:
+            return self._refresher.refresh_now(timeout)
+        self._load_menus()
+        self._last_reload = datetime.utcnow()
+        return True
+
+    def _get_menu(self, record: SearchRecord) -> Optional[MenuItem]:
+        """Return the full MenuItem behind a record, loading it on demand"""
+        menu = self._menu_cache.get(record)
+        if menu is None:
+            try:
+                menu = self.storage.load_menu_file(record.path)
+            except Exception:
+                return None  # Already logged; the file vanished or broke since indexing
+            self._menu_cache.put(record, menu)
+        return menu
+
+    def record_access(self, menu_id: str) -> None:
+        """Count an access of a menu (e.g. a clicked result); no disk I/O"""
+        if self._usage is not None:
+            self._usage.record_access(menu_id)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return query cache hit/miss/eviction counters"""
+        return self._query_cache.stats()
+
+    def _truncate_query(self, query: str) -> str:
+        """Truncate the query to SEARCH_CONFIG["max_query_length"]"""
+        max_length = SEARCH_CONFIG["max_query_length"]
+        if len(query) > max_length:
+            logger.warning(f"Truncating search query of {len(query)} characters to {max_length}")
+            query = query[:max_length]
+        return query
+
+    def _normalize_query(self, query: str) -> str:
+        """Normalize the query, truncating it to SEARCH_CONFIG["max_query_length"]"""
+        return self.pipeline.normalize(self._truncate_query(query))
+
     def _tokenize(self, text: str) -> Set[str]:
-        """Convert text to lowercase tokens"""
-        return set(text.lower().split())
+        """Convert normalized text to tokens"""
+        return self.pipeline.tokens(text)
+
+    def _correct_query(self, index, query: str,
+                       query_tokens: Set[str]) -> Tuple[Set[str], Optional[str]]:
+        """Add spelling corrections for tokens missing from the corpus vocabulary.
+
+        Returns the expanded token set and the query with misspelled words
+        replaced (None when nothing was corrected), so both token and
+        phrase matching see the corrected spelling.
+        """
+        if not self.fuzzy or not query_tokens:
+            return query_tokens, None
+        matcher = index.fuzzy_matcher
+        corrections = {}
+        for token in query_tokens:
+            corrected = matcher.correct(token)
+            if corrected is not None:
+                corrections[token] = corrected
+        if not corrections:
+            return query_tokens, None
+        corrected_query = " ".join(corrections.get(word, word) for word in query.split())
+        return query_tokens | set(corrections.values()), corrected_query
 
-    def search(self, query: str) -> List[Tuple[float, MenuItem]]:
-        """Search menus with enhanced scoring"""
+    def search(self, query: str, limit: Optional[int] = None, offset: int = 0,
+               mode: str = "lexical",
+               filters: Optional[SearchFilters] = None,
+               related_weight: Optional[float] = None) -> List[Tuple[float, MenuItem]]:
+        """Search menus with enhanced scoring.
+
+        Returns at most ``limit`` results (default SEARCH_CONFIG["max_results"])
+        starting at ``offset``, ordered by score, then menu order. ``mode``
+        selects the rule-based "lexical" scorer, embedding-based "semantic"
+        search, or a "hybrid" fusion of both. ``filters`` restricts the
+        candidate menus by category, subcategory, context and the caller's
+        permissions before any scoring. A positive ``related_weight``
+        (default SEARCH_CONFIG["related_weight"]) passes that share of each
+        result's score to the menus it depends on or shares a workflow with,
+        which can pull them into the results.
+        """
+        return self.search_detailed(query, limit, offset, mode, filters,
+                                    related_weight).results
+
+    def search_detailed(self, query: str, limit: Optional[int] = None, offset: int = 0,
+                        mode: str = "lexical",
+                        filters: Optional[SearchFilters] = None,
+                        related_weight: Optional[float] = None) -> SearchResponse:
+        """Search like ``search`` and report how the results were produced"""
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        if mode == "semantic" and self._semantic is None:
+            raise ValueError("Semantic search is not enabled")
+        started = time.perf_counter()
         self._check_reload()  # Ensure menus are fresh
-        
-        query = query.lower()
-        query_tokens = self._tokenize(query)
-        results = []
+        if limit is None:
+            limit = SEARCH_CONFIG["max_results"]
+        offset = max(offset, 0)
+        if related_weight is None:
+            related_weight = SEARCH_CONFIG["related_weight"]
 
-        for menu in self._menus:
-            if not menu.menu_details.active:
-                continue
+        snapshot = self._snapshot
+        index = snapshot.index
+        # The encoder gets the text as typed; normalization is for lexical matching
+        raw_query = self._truncate_query(query)
+        with metrics.stage("search.normalize"):
+            query = self.pipeline.normalize(raw_query)
 
-            score = self._calculate_score(query, query_tokens, menu)
-            if score > 0:
-                results.append((score, menu))
+        if filters is not None and not filters.active:
+            filters = None
+        # The snapshot version keeps entries computed against an older load from ever matching
+        cache_key = (snapshot.version, mode, query, limit + offset, filters, related_weight)
+        with metrics.stage("search.cache_lookup"):
+            cached = self._query_cache.get(cache_key)
+        degraded = False
+        if cached is not None:
+            metrics.increment("search.cache_hits")
+            ranked, semantic_used = cached
+        else:
+            metrics.increment("search.cache_misses")
+            with metrics.stage("search.filter"):
+                allowed = snapshot.filters.allowed(filters)
+            depth = offset + limit
+            if related_weight > 0:
+                # Related menus may outrank results just below the requested page
+                depth = max(depth, SEARCH_CONFIG["hybrid_candidates"])
+            if mode == "semantic":
+                ranked = self._semantic_top_k(snapshot, raw_query, depth, allowed)
+                semantic_used = True
+            elif mode == "hybrid":
+                ranked, semantic_used, degraded = self._hybrid_top_k(
+                    snapshot, query, raw_query, depth, started, allowed
+                )
+            else:
+                with metrics.stage("search.tokenize"):
+                    query_tokens = self._tokenize(query)
+                with metrics.stage("search.fuzzy"):
+                    query_tokens, corrected = self._correct_query(index, query, query_tokens)
+                ranked = index.top_k(query, query_tokens, depth, corrected,
+                                     SEARCH_CONFIG["popularity_weight"], allowed)
+                semantic_used = False
+            if related_weight > 0:
+                with metrics.stage("search.related"):
+                    ranked = self._boost_related(snapshot, ranked, related_weight,
+                                                 offset + limit, allowed)
+            # A degraded answer should not stick once the semantic path recovers
+            if not degraded:
+                self._query_cache.put(cache_key, (ranked, semantic_used))
 
-        # Sort by score and menu order
-        results.sort(key=lambda x: (-x[0], x[1].menu_details.order))
+        results = []
+        with metrics.stage("search.materialize"):
+            for score, path in ranked[offset:]:
+                menu = self._get_menu(index.get(path))
+                if menu is not None:
+                    results.append((score, menu))
+        if self._usage is not None:
+            self._usage.record_search_hits(menu.id for _, menu in results)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        metrics.increment("search.queries")
+        metrics.observe("search.total", elapsed_ms)
+        return SearchResponse(
+            results=results,
+            mode=mode,
+            semantic_used=semantic_used,
+            degraded=degraded,
+            cached=cached is not None,
+            elapsed_ms=elapsed_ms,
+        )
+
+    def search_many(self, queries: Sequence[str], limit: Optional[int] = None,
+                    offset: int = 0,
+                    filters: Optional[SearchFilters] = None,
+                    related_weight: Optional[float] = None) -> List[List[Tuple[float, MenuItem]]]:
+        """Lexical search for many queries in one vectorized pass.
+
+        Returns the same ranked lists as calling ``search`` once per query,
+        in input order, and counts the same search hits.
+        """
+        results = []
+        for ranked in self.rank_many(queries, limit, offset, filters, related_weight):
+            menus = ((score, self._get_menu(record)) for score, record in ranked)
+            results.append([(score, menu) for score, menu in menus if menu is not None])
         return results
 
-    def _calculate_score(self, query: str, query_tokens: Set[str], menu: MenuItem) -> float:
-        """Calculate search score for a menu"""
-        score = 0.0
-        
-        # Direct matches
-        if query in menu.name.lower():
-            score += 1.0
-        if query in menu.description.lower():
-            score += 0.8
-
-        # Primary terms matching
-        for term, synonyms in menu.query_enhancers.primary_terms.items():
-            if term.lower() in query_tokens:
-                score += 0.7
-                for syn in synonyms.split():
-                    if syn.lower() in query_tokens:
-                        score += 0.1
-
-        # Action terms matching
-        for actions in menu.query_enhancers.action_terms.values():
-            for term, synonyms in actions.items():
-                if term.lower() in query_tokens:
-                    score += 0.6
-                    for syn in synonyms.split():
-                        if syn.lower() in query_tokens:
-                            score += 0.1
-
-        # Error tolerant terms matching
-        for variations in menu.query_enhancers.error_tolerant_terms.values():
-            for variants in variations.values():
-                if any(variant.lower() in query_tokens for variant in variants):
-                    score += 0.5
-
-        # Keywords matching
-        if any(kw.lower() in query for kw in menu.search_metadata.keywords):
-            score += 0.4
-
-        # Search phrases matching
-        phrases = (
-            menu.search_metadata.search_phrases.questions +
-            menu.search_metadata.search_phrases.commands
-        )
-        if any(phrase.lower() in query for phrase in phrases):
-            score += 0.4
+    def rank_many(self, queries: Sequence[str], limit: Optional[int] = None,
+                  offset: int = 0,
+                  filters: Optional[SearchFilters] = None,
+                  related_weight: Optional[float] = None) -> List[List[Tuple[float, SearchRecord]]]:
+        """Rank many queries without materializing MenuItems.
+
+        Queries are scored in chunks of SEARCH_CONFIG["batch_size"] with the
+        snapshot's sparse-matrix BatchScorer, to bound memory. ``filters``
+        and ``related_weight`` apply to every query, as in ``search``.
+        """
+        self._check_reload()
+        if limit is None:
+            limit = SEARCH_CONFIG["max_results"]
+        offset = max(offset, 0)
+        if related_weight is None:
+            related_weight = SEARCH_CONFIG["related_weight"]
+        depth = offset + limit
+        if related_weight > 0:
+            # Related menus may outrank results just below the requested page
+            depth = max(depth, SEARCH_CONFIG["hybrid_candidates"])
+
+        snapshot = self._snapshot
+        index = snapshot.index
+        allowed = snapshot.filters.allowed(filters)
+        normalized = [self._normalize_query(query) for query in queries]
+        token_sets, corrected = [], []
+        for query in normalized:
+            query_tokens, corrected_query = self._correct_query(index, query, self._tokenize(query))
+            token_sets.append(query_tokens)
+            corrected.append(corrected_query)
+
+        try:
+            scorer = index.batch_scorer
+        except ImportError as e:
+            logger.warning(f"Vectorized batch scoring unavailable ({e}); scoring one query at a time")
+            scorer = None
+
+        ranked_lists: List[List[Tuple[float, Path]]] = []
+        batch_size = SEARCH_CONFIG["batch_size"]
+        popularity_weight = SEARCH_CONFIG["popularity_weight"]
+        for start in range(0, len(normalized), batch_size):
+            chunk = normalized[start:start + batch_size]
+            tokens = token_sets[start:start + batch_size]
+            fixes = corrected[start:start + batch_size]
+            if scorer is not None:
+                ranked_lists.extend(scorer.top_k_many(chunk, tokens, depth, fixes,
+                                                      popularity_weight, allowed))
+            else:
+                ranked_lists.extend(
+                    index.top_k(query, query_tokens, depth, corrected_query=fix,
+                                popularity_weight=popularity_weight, allowed=allowed)
+                    for query, query_tokens, fix in zip(chunk, tokens, fixes)
+                )
+
+        if related_weight > 0:
+            ranked_lists = [
+                self._boost_related(snapshot, ranked, related_weight, offset + limit, allowed)
+                for ranked in ranked_lists
+            ]
+        pages = [
+            [(score, index.get(path)) for score, path in ranked[offset:]]
+            for ranked in ranked_lists
+        ]
+        if self._usage is not None:
+            self._usage.record_search_hits(record.id for page in pages for _, record in page)
+        return pages
+
+    def _hybrid_top_k(self, snapshot: MenuSnapshot, query: str, raw_query: str, k: int,
+                      started: float, allowed: Optional[AbstractSet[Hashable]] = None
+                      ) -> Tuple[List[Tuple[float, Path]], bool, bool]:
+        """Fuse lexical and semantic rankings within the per-query latency budget.
 
-        # Regional variations matching
-        for variations in menu.search_metadata.search_phrases.regional_variations.values():
-            if any(var.lower() in query for var in variations):
-                score += 0.3
+        ``query`` is normalized for lexical scoring; ``raw_query`` is the
+        truncated text as typed, for the encoder. Returns the ranking,
+        whether the semantic pass contributed, and whether it was skipped
+        because of the budget or an error.
+        """
+        index = snapshot.index
+        depth = max(k, SEARCH_CONFIG["hybrid_candidates"])
+        query_tokens, corrected = self._correct_query(index, query, self._tokenize(query))
+        lexical = index.top_k(query, query_tokens, depth, corrected,
+                              SEARCH_CONFIG["popularity_weight"], allowed)
+        if self._semantic is None or lexical_is_decisive(
+            lexical, SEARCH_CONFIG["hybrid_decisive_score"], SEARCH_CONFIG["hybrid_decisive_margin"]
+        ):
+            return lexical[:k], False, False
 
-        return score
+        budget = SEARCH_CONFIG["semantic_budget_ms"] / 1000
+        semantic = self._semantic_within(snapshot, raw_query, depth,
+                                         budget - (time.perf_counter() - started), allowed)
+        if semantic is None:
+            return lexical[:k], False, True
 
-    def get_categories(self) -> List[str]:
-        """Get list of unique categories"""
+        if SEARCH_CONFIG["hybrid_fusion"] == "weighted":
+            fused = weighted_fusion(lexical, semantic, SEARCH_CONFIG["hybrid_semantic_weight"])
+        else:
+            fused = reciprocal_rank_fusion([lexical, semantic], SEARCH_CONFIG["rrf_k"])
+        return rank(fused, lambda path: index.get(path).order, k), True, False
+
+    def _boost_related(self, snapshot: MenuSnapshot, ranked: List[Tuple[float, Path]],
+                       weight: float, k: int,
+                       allowed: Optional[AbstractSet[Hashable]] = None
+                       ) -> List[Tuple[float, Path]]:
+        """Boost menus related to ranked ones by weight * score * strength.
+
+        Each menu takes its largest boost rather than the sum, so a hub
+        linked to every result does not outrank the results themselves.
+        """
+        boosts: Dict[Path, float] = {}
+        for score, path in ranked:
+            for strength, other in snapshot.graph.related_keys(path):
+                if allowed is None or other in allowed:
+                    boosts[other] = max(boosts.get(other, 0.0), weight * score * strength)
+        fused = {path: score for score, path in ranked}
+        for path, boost in boosts.items():
+            fused[path] = fused.get(path, 0.0) + boost
+        return rank(fused, lambda path: snapshot.index.get(path).order, k)
+
+    def _semantic_within(self, snapshot: MenuSnapshot, query: str, k: int, timeout: float,
+                         allowed: Optional[AbstractSet[Hashable]] = None
+                         ) -> Optional[List[Tuple[float, Path]]]:
+        """Run the semantic lookup on the worker pool, giving up after timeout seconds"""
+        if timeout <= 0:
+            return None
+        with self._semantic_pool_lock:
+            # Shed load instead of queueing when embedding already lags behind
+            if self._semantic_in_flight >= SEARCH_CONFIG["semantic_workers"]:
+                return None
+            if self._semantic_pool is None:
+                self._semantic_pool = ThreadPoolExecutor(
+                    max_workers=SEARCH_CONFIG["semantic_workers"],
+                    thread_name_prefix="semantic-search",
+                )
+            self._semantic_in_flight += 1
+        future = self._semantic_pool.submit(self._semantic_top_k, snapshot, query, k, allowed)
+        future.add_done_callback(self._semantic_done)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            logger.warning(f"Semantic search exceeded its {timeout * 1000:.0f}ms budget")
+        except Exception as e:
+            logger.error(f"Semantic search failed: {e}")
+        return None
+
+    def _semantic_done(self, _future) -> None:
+        with self._semantic_pool_lock:
+            self._semantic_in_flight -= 1
+
+    def _semantic_top_k(self, snapshot: MenuSnapshot, query: str, k: int,
+                        allowed: Optional[AbstractSet[Hashable]] = None) -> List[Tuple[float, Path]]:
+        """Nearest menus to the un-normalized query by embedding.
+
+        Keeps hits within threshold_multiplier of the best match.
+        """
+        if self._semantic is None:
+            raise ValueError("Semantic search is not enabled")
+        depth = k
+        if allowed is not None:
+            # Enough neighbours that k allowed ones survive the filter
+            depth = min(len(snapshot.index), k + len(snapshot.index) - len(allowed))
+        hits = [
+            (similarity, path) for similarity, path in self._semantic.search(query, depth)
+            if path in snapshot.index and similarity > 0 and (allowed is None or path in allowed)
+        ][:k]
+        if not hits:
+            return []
+        cutoff = hits[0][0] * SEARCH_CONFIG["threshold_multiplier"]
+        return [(similarity, path) for similarity, path in hits if similarity >= cutoff]
+
+    def related(self, menu_id: str, k: Optional[int] = None) -> List[Tuple[float, MenuItem]]:
+        """Menus linked to menu_id by dependencies, workflow states or related terms.
+
+        Returns up to ``k`` (default SEARCH_CONFIG["graph_max_related"])
+        active menus within SEARCH_CONFIG["graph_hops"] links, strongest
+        link first. The lists are precomputed when menus load.
+        """
+        self._check_reload()
+        snapshot = self._snapshot
+        results = []
+        for strength, path in snapshot.graph.related(menu_id, k):
+            menu = self._get_menu(snapshot.index.get(path))
+            if menu is not None:
+                results.append((strength, menu))
+        return results
+
+    def suggest(self, prefix: str, k: Optional[int] = None) -> List[Suggestion]:
+        """As-you-type suggestions for a partial query.
+
+        Returns up to ``k`` (default SEARCH_CONFIG["max_suggestions"]) menu
+        names, keywords and commands containing a word that starts with the
+        prefix, most searched first.
+        """
         self._check_reload()
-        return sorted(list(set(menu.menu_details.category for menu in self._menus)))
+        if k is None:
+            k = SEARCH_CONFIG["max_suggestions"]
+        prefix = prefix[:SEARCH_CONFIG["max_query_length"]]
+        return self._snapshot.suggestions.suggest(prefix, k)
 
-    def get_menus_by_category(self, category: str) -> List[MenuItem]:
-        """Get all active menus in a category"""
+    def get_categories(self, filters: Optional[SearchFilters] = None) -> List[str]:
+        """Get list of unique categories, or those with active menus passing filters"""
         self._check_reload()
+        snapshot = self._snapshot
+        allowed = snapshot.filters.allowed(filters)
+        if allowed is None:
+            return list(snapshot.categories)
         return [
-            menu for menu in self._menus 
-            if menu.menu_details.active and menu.menu_details.category == category
-        ]
\ No newline at end of file
+            category for category, records in sorted(snapshot.records_by_category.items())
+            if any(record.path in allowed for record in records)
+        ]
+
+    def get_menus_by_category(self, category: str,
+                              filters: Optional[SearchFilters] = None) -> List[MenuItem]:
+        """Get all active menus in a category, optionally narrowed by filters"""
+        self._check_reload()
+        snapshot = self._snapshot
+        records = snapshot.records_by_category.get(category, ())
+        if filters is not None and filters.active:
+            allowed = snapshot.filters.allowed(replace(filters, category=category))
+            records = [record for record in records if record.path in allowed]
+        menus = (self._get_menu(record) for record in records)
+        return [menu for menu in menus if menu is not None]
\ No newline at end of file
@@ -0,0 +1,204 @@
+# services/semantic_engine.py
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from config.settings import DATA_DIR, SEARCH_CONFIG
+from models.menu import MenuItem
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Maps a batch of texts to an (n, dim) float32 array
+Encoder = Callable[[Sequence[str]], "numpy.ndarray"]
+
+
+def menu_text(menu: MenuItem) -> str:
+    """Text embedded for a menu: name, description, questions and commands"""
+    phrases = menu.search_metadata.search_phrases
+    return ". ".join([menu.name, menu.description, *phrases.questions, *phrases.commands])
+
+
+class SemanticSearchEngine:
+    """Dense-vector menu search over a FAISS inner-product index.
+
+    Each menu's text is embedded with the configured sentence-transformers
+    model and stored under a stable integer id, so reloads only re-encode
+    menus whose text changed. The index is persisted under ``index_dir``.
+    numpy, faiss and sentence-transformers are imported on first use.
+    """
+
+    def __init__(self, index_dir: Path = DATA_DIR / "semantic",
+                 model_name: str = SEARCH_CONFIG["model_name"],
+                 encoder: Optional[Encoder] = None):
+        self.index_dir = index_dir
+        self.model_name = model_name
+        self._encoder = encoder
+        self._lock = threading.RLock()
+        self._index = None
+        # path -> (faiss id, text hash)
+        self._ids: Dict[Path, Tuple[int, str]] = {}
+        self._paths: Dict[int, Path] = {}
+        self._next_id = 0
+        self._load_index()
+
+    @property
+    def _index_file(self) -> Path:
+        return self.index_dir / "menus.faiss"
+
+    @property
+    def _ids_file(self) -> Path:
+        return self.index_dir / "menus.ids.json"
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _encode(self, texts: Sequence[str]):
+        """Embed texts in one batch as L2-normalized float32 vectors"""
+        import numpy as np
+
+        if self._encoder is None:
+            self._encoder = self._load_model()
+        vectors = np.asarray(self._encoder(list(texts)), dtype='float32')
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _load_model(self) -> Encoder:
+        """Load the sentence-transformers model on CPU from the local cache"""
+        if SEARCH_CONFIG["model_offline"]:
+            # Never reach out to the hub from a serving process
+            os.environ.setdefault("HF_HUB_OFFLINE", "1")
+            os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+        try:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(
+                self.model_name,
+                device="cpu",
+                cache_folder=str(SEARCH_CONFIG["model_cache_dir"]),
+            )
+        except Exception as e:
+            logger.error(f"Failed to load embedding model {self.model_name}: {e}")
+            raise Exception(f"Failed to load embedding model: {e}")
+        logger.info(f"Loaded embedding model {self.model_name}")
+        return lambda texts: model.encode(
+            texts, batch_size=64, convert_to_numpy=True, show_progress_bar=False
+        )
+
+    def _new_index(self, dim: int):
+        import faiss
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+
+    def _load_index(self) -> None:
+        """Restore a persisted index built with the same model"""
+        if not self._index_file.exists() or not self._ids_file.exists():
+            return
+        try:
+            import faiss
+            with open(self._ids_file, 'r') as f:
+                saved = json.load(f)
+            if saved.get("model_name") != self.model_name:
+                logger.warning(f"Ignoring semantic index built with {saved.get('model_name')}")
+                return
+            self._index = faiss.read_index(str(self._index_file))
+            self._ids = {
+                Path(path): (faiss_id, text_hash)
+                for path, (faiss_id, text_hash) in saved["ids"].items()
+            }
+            self._paths = {faiss_id: path for path, (faiss_id, _) in self._ids.items()}
+            self._next_id = saved["next_id"]
+            logger.info(f"Loaded semantic index with {len(self._ids)} menus")
+        except Exception as e:
+            logger.error(f"Failed to load semantic index: {e}")
+            self._index = None
+            self._ids, self._paths, self._next_id = {}, {}, 0
+
+    def save(self) -> None:
+        """Persist the index and id map, replacing any previous copy atomically"""
+        with self._lock:
+            if self._index is None:
+                return
+            import faiss
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            tmp_index = self._index_file.with_name(self._index_file.name + ".tmp")
+            tmp_ids = self._ids_file.with_name(self._ids_file.name + ".tmp")
+            faiss.write_index(self._index, str(tmp_index))
+            with open(tmp_ids, 'w') as f:
+                json.dump({
+                    "model_name": self.model_name,
+                    "next_id": self._next_id,
+                    "ids": {str(path): list(entry) for path, entry in self._ids.items()},
+                }, f)
+            os.replace(tmp_index, self._index_file)
+            os.replace(tmp_ids, self._ids_file)
+
+    def missing(self, paths: Iterable[Path]) -> List[Path]:
+        """Return the paths that have no embedding yet"""
+        return [path for path in paths if path not in self._ids]
+
+    def prune(self, keep: Iterable[Path], persist: bool = True) -> int:
+        """Drop embeddings of menus not in keep; returns the number dropped"""
+        keep = set(keep)
+        with self._lock:
+            stale = [path for path in self._ids if path not in keep]
+        if stale:
+            self.sync({}, stale, persist=persist)
+        return len(stale)
+
+    def sync(self, updated: Dict[Path, MenuItem], removed: Iterable[Path] = (),
+             persist: bool = True) -> int:
+        """Re-embed changed menus and drop removed ones; returns the number encoded"""
+        import numpy as np
+
+        texts = {path: menu_text(menu) for path, menu in updated.items()
+                 if menu.menu_details.active}
+        hashes = {path: hashlib.sha1(text.encode('utf-8')).hexdigest()
+                  for path, text in texts.items()}
+        # Inactive menus are dropped like deleted ones
+        stale = set(removed) | {path for path in updated if path not in texts}
+        to_encode = [path for path in texts
+                     if self._ids.get(path, (None, None))[1] != hashes[path]]
+        stale.update(path for path in to_encode if path in self._ids)
+
+        vectors = self._encode([texts[path] for path in to_encode]) if to_encode else None
+
+        with self._lock:
+            drop = [self._ids.pop(path)[0] for path in stale if path in self._ids]
+            if drop and self._index is not None:
+                self._index.remove_ids(np.asarray(drop, dtype='int64'))
+            for faiss_id in drop:
+                self._paths.pop(faiss_id, None)
+
+            if vectors is not None:
+                if self._index is None:
+                    self._index = self._new_index(vectors.shape[1])
+                ids = np.arange(self._next_id, self._next_id + len(to_encode), dtype='int64')
+                self._next_id += len(to_encode)
+                self._index.add_with_ids(vectors, ids)
+                for path, faiss_id in zip(to_encode, ids.tolist()):
+                    self._ids[path] = (faiss_id, hashes[path])
+                    self._paths[faiss_id] = path
+
+        if persist and (drop or to_encode):
+            self.save()
+        return len(to_encode)
+
+    def search_many(self, queries: Sequence[str], k: int) -> List[List[Tuple[float, Path]]]:
+        """Return the k nearest menus for each query as (cosine similarity, path)"""
+        if not queries or k <= 0 or self._index is None or not self._ids:
+            return [[] for _ in queries]
+        vectors = self._encode(queries)
+        with self._lock:
+            similarities, ids = self._index.search(vectors, min(k, len(self._ids)))
+            paths = self._paths
+            return [
+                [(float(sim), paths[faiss_id])
+                 for sim, faiss_id in zip(row_sims, row_ids) if faiss_id in paths]
+                for row_sims, row_ids in zip(similarities, ids.tolist())
+            ]
+
+    def search(self, query: str, k: int) -> List[Tuple[float, Path]]:
+        """Return the k nearest menus for a single query"""
+        return self.search_many([query], k)[0]
@@ -0,0 +1,187 @@
+# services/suggestion_index.py
+import heapq
+from bisect import bisect_left
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+from config.settings import SEARCH_CONFIG
+from models.search_record import SearchRecord
+from utils.lru_cache import LRUCache
+
+# How a suggestion ranks: search_hits (negated), menu order, starts
+# mid-phrase, text length, text, then the record key as a string (much
+# cheaper to compare than a Path) and the key itself
+Rank = Tuple[int, int, bool, int, str, str, Hashable]
+# (matched text, record key as a string, suggestion position, rank)
+Entry = Tuple[str, str, int, Rank]
+
+
+# Sort key of the rank-ordered entry list; unique per entry
+_rank_order = itemgetter(3, 0, 2)
+
+
+def _bisect(entries: List[Entry], entry: Entry, key=None) -> int:
+    """bisect_left on a list sorted by key (bisect's own key= needs Python 3.10)"""
+    if key is None:
+        return bisect_left(entries, entry)
+    target = key(entry)
+    low, high = 0, len(entries)
+    while low < high:
+        middle = (low + high) // 2
+        if key(entries[middle]) < target:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _spliced(entries: List[Entry], stale: List[Entry], fresh: List[Entry], key=None) -> List[Entry]:
+    """A copy of a sorted list with stale entries removed and fresh ones inserted.
+
+    Positions are found by bisection and the untouched runs are copied
+    as slices, so the cost is one list copy plus a few bisections per
+    changed entry rather than a pass over every entry in Python.
+    """
+    fresh = sorted(fresh, key=key)
+    events = sorted(
+        [(_bisect(entries, entry, key), 0, i) for i, entry in enumerate(fresh)] +
+        [(_bisect(entries, entry, key), 1, i) for i, entry in enumerate(stale)]
+    )
+    result: List[Entry] = []
+    cursor = 0
+    for position, removal, i in events:
+        result.extend(entries[cursor:position])
+        cursor = position
+        if removal:
+            cursor += 1
+        else:
+            result.append(fresh[i])
+    result.extend(entries[cursor:])
+    return result
+
+
+class Suggestion(NamedTuple):
+    text: str
+    menu_id: str
+    path: Path
+
+
+class SuggestionIndex:
+    """Sorted-array prefix index over menu names, keywords and commands.
+
+    Every suggestion is stored once per word it contains, as the text from
+    that word to the end, so "res" finds "Examination Results". Entries
+    are kept twice, sorted by text and sorted by rank (search_hits, then
+    menu order, preferring matches at the start of a suggestion). A
+    narrow prefix is answered by bisecting to its range in the text order;
+    a broad one by walking the rank order until k suggestions match, so
+    the cost follows k rather than the number of matches. Answers are
+    memoized per index.
+    """
+
+    def __init__(self, records: Iterable[SearchRecord] = ()):
+        self._records: Dict[Hashable, SearchRecord] = {}
+        self._record_entries: Dict[Hashable, List[Entry]] = {}
+        entries: List[Entry] = []
+        for record in records:
+            if record.active:
+                self._records[record.path] = record
+                self._record_entries[record.path] = self._entries_for(record)
+                entries.extend(self._record_entries[record.path])
+        entries.sort()
+        self._entries = entries
+        # Stable, so equal ranks stay in text order, as _rank_order has them
+        self._ranked = sorted(entries, key=itemgetter(3))
+        self._cache = LRUCache(SEARCH_CONFIG["suggest_cache_size"])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _entries_for(record: SearchRecord) -> List[Entry]:
+        entries = []
+        sort_key = str(record.path)
+        for position, text in enumerate(record.suggestions):
+            words = text.lower().split()
+            rank = (-record.search_hits, record.order, False, len(text), text, sort_key, record.path)
+            for start in range(len(words)):
+                if start == 1:
+                    rank = rank[:2] + (True,) + rank[3:]
+                entries.append((" ".join(words[start:]), sort_key, position, rank))
+        return entries
+
+    def updated(self, changed: Iterable[SearchRecord],
+                removed: Iterable[Hashable] = ()) -> 'SuggestionIndex':
+        """Return a new index with changed menus re-indexed and removed ones dropped.
+
+        Only the entries of changed menus are located and replaced in the
+        two sorted lists; this index is left unmodified.
+        """
+        changed = {record.path: record for record in changed}
+        stale_keys = set(removed)
+        stale_keys.update(changed)
+
+        index = SuggestionIndex.__new__(SuggestionIndex)
+        index._records = dict(self._records)
+        index._record_entries = dict(self._record_entries)
+        stale: List[Entry] = []
+        for key in stale_keys:
+            index._records.pop(key, None)
+            stale.extend(index._record_entries.pop(key, ()))
+        fresh: List[Entry] = []
+        for record in changed.values():
+            if record.active:
+                index._records[record.path] = record
+                index._record_entries[record.path] = self._entries_for(record)
+                fresh.extend(index._record_entries[record.path])
+        index._entries = _spliced(self._entries, stale, fresh)
+        index._ranked = _spliced(self._ranked, stale, fresh, _rank_order)
+        index._cache = LRUCache(SEARCH_CONFIG["suggest_cache_size"])
+        return index
+
+    def suggest(self, prefix: str, k: int) -> List[Suggestion]:
+        """Return up to k distinct suggestions whose words start with prefix"""
+        words = prefix.lower().split()
+        if not words or k <= 0:
+            return []
+        # A trailing space means the last word is complete
+        prefix = " ".join(words) + (" " if prefix[-1].isspace() else "")
+
+        cache_key = (prefix, k)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        entries = self._entries
+        start = bisect_left(entries, (prefix,))
+        end = bisect_left(entries, (prefix + "\U0010ffff",), start)
+        ranks = None
+        if (end - start) ** 2 > k * len(entries):
+            # Many matches: the first k distinct ones in rank order are the answer
+            ranks = self._first_ranked(prefix, k, end - start)
+        if ranks is None:
+            best: Dict[str, Rank] = {}
+            for i in range(start, end):
+                rank = entries[i][3]
+                folded = rank[4].lower()
+                if folded not in best or rank < best[folded]:
+                    best[folded] = rank
+            ranks = heapq.nsmallest(k, best.values())
+
+        suggestions = [
+            Suggestion(rank[4], self._records[rank[6]].id, rank[6]) for rank in ranks
+        ]
+        self._cache.put(cache_key, suggestions)
+        return suggestions
+
+    def _first_ranked(self, prefix: str, k: int, budget: int) -> Optional[List[Rank]]:
+        """Best k distinct suggestions from the rank order, or None past budget entries"""
+        found: Dict[str, Rank] = {}
+        for scanned, (match, _, _, rank) in enumerate(self._ranked):
+            if scanned >= budget:
+                return None  # Matches cluster low in the ranking; scanning the range is cheaper
+            if match.startswith(prefix):
+                found.setdefault(rank[4].lower(), rank)
+                if len(found) == k:
+                    break
+        return list(found.values())
@@ -0,0 +1,145 @@
+# services/usage_metrics.py
+import atexit
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from utils.logger import get_logger
+
+logger = get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    menu_id TEXT PRIMARY KEY,
+    search_hits INTEGER NOT NULL DEFAULT 0,
+    access_count INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+_UPSERT = """
+INSERT INTO usage (menu_id, search_hits, access_count) VALUES (?, ?, ?)
+ON CONFLICT(menu_id) DO UPDATE SET
+    search_hits = search_hits + excluded.search_hits,
+    access_count = access_count + excluded.access_count
+"""
+
+
+class UsageCounts(NamedTuple):
+    search_hits: int = 0
+    access_count: int = 0
+
+
+class UsageMetricsAggregator:
+    """Batched, append-only usage counting for menus.
+
+    Hits are counted in memory on the request path and added to a SQLite
+    table every ``flush_interval`` seconds by a background thread, so menu
+    JSON files are never rewritten. Additive upserts let several processes
+    share one database. ``totals`` combines flushed and pending counts;
+    the search service folds them into its records at reload time.
+    """
+
+    def __init__(self, path: Path, flush_interval: float = 30.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+
+    def start(self) -> None:
+        """Start the periodic flush thread; pending counts are also flushed at exit"""
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_periodically,
+                                             name="usage-metrics-flusher", daemon=True)
+            self._flusher.start()
+            atexit.register(self.close)
+
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Usage metrics flush failed: {e}")
+
+    def close(self) -> None:
+        """Stop the flush thread and write out whatever is still pending"""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+
+    def record_search_hits(self, menu_ids: Iterable[str]) -> None:
+        """Count one search hit for every menu returned by a search"""
+        with self._lock:
+            for menu_id in menu_ids:
+                self._pending.setdefault(menu_id, [0, 0])[0] += 1
+
+    def record_access(self, menu_id: str) -> None:
+        """Count one access of a menu, e.g. the user opened a result"""
+        with self._lock:
+            self._pending.setdefault(menu_id, [0, 0])[1] += 1
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(self.path), timeout=10)
+        connection.execute(_SCHEMA)
+        return connection
+
+    def flush(self) -> int:
+        """Add pending counts to the database; returns how many menus were written"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                connection = self._connect()
+                try:
+                    with connection:
+                        connection.executemany(_UPSERT, (
+                            (menu_id, hits, accesses) for menu_id, (hits, accesses) in pending.items()
+                        ))
+                finally:
+                    connection.close()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to flush usage metrics to {self.path}: {e}")
+                # Keep the counts for the next attempt
+                with self._lock:
+                    for menu_id, (hits, accesses) in pending.items():
+                        counts = self._pending.setdefault(menu_id, [0, 0])
+                        counts[0] += hits
+                        counts[1] += accesses
+                return 0
+            return len(pending)
+
+    def totals(self) -> Dict[str, UsageCounts]:
+        """Flushed plus pending counts per menu id"""
+        with self._flush_lock:  # Counts being flushed are in neither place
+            return self._totals()
+
+    def _totals(self) -> Dict[str, UsageCounts]:
+        totals: Dict[str, List[int]] = {}
+        if self.path.exists():
+            try:
+                connection = self._connect()
+                try:
+                    for menu_id, hits, accesses in connection.execute(
+                        "SELECT menu_id, search_hits, access_count FROM usage"
+                    ):
+                        totals[menu_id] = [hits, accesses]
+                finally:
+                    connection.close()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to read usage metrics from {self.path}: {e}")
+        with self._lock:
+            for menu_id, (hits, accesses) in self._pending.items():
+                counts = totals.setdefault(menu_id, [0, 0])
+                counts[0] += hits
+                counts[1] += accesses
+        return {menu_id: UsageCounts(*counts) for menu_id, counts in totals.items()}
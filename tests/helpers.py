@@ -0,0 +1,149 @@
+# tests/helpers.py
+import json
+import random
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from models.menu import MenuItem
+from models.search_record import SearchRecord
+
+MODULES = ["exam", "fees", "hostel", "library", "transport", "payroll"]
+SUBJECTS = ["results", "payment", "schedule", "report", "register", "approval"]
+ROLES = ["admin", "student", "faculty"]
+STATES = ["fees-draft", "fees-approved", "exam-scheduled", "library-issued"]
+
+
+def menu_dict(number: int, search_hits: int = 0, **details: Any) -> Dict[str, Any]:
+    """A small menu in the data/menus layout, varied by number.
+
+    Names repeat across numbers, ids do not. ``details`` override fields
+    of menu_details.
+    """
+    rng = random.Random(number)
+    module, subject = rng.choice(MODULES), rng.choice(SUBJECTS)
+    timestamp = "2025-02-05T00:00:00Z"
+    menu = {
+        "id": f"{module}-{subject}-{number}",
+        "name": f"{module.title()} {subject.title()}",
+        "description": f"View and manage {module} {subject} for {rng.choice(ROLES)} workflows",
+        "url": f"{module}/{subject}/{number}",
+        "query_enhancers": {
+            "primary_terms": {module: f"{rng.choice(SUBJECTS)} {rng.choice(MODULES)}",
+                              subject: rng.choice(MODULES)},
+            "action_terms": {"view": {"primary": "show open display"}},
+            "error_tolerant_terms": {"spelling_variations": {module: [module[1:], module + module[-1]]}},
+        },
+        "search_metadata": {
+            "keywords": [module, subject, f"{module} {rng.choice(SUBJECTS)}"],
+            "search_phrases": {
+                "questions": [f"how do i check my {module} {subject}"],
+                "commands": [f"view {module} {subject}", f"open {subject}"],
+                "regional_variations": {"indian": [f"{module} {subject} kahan hai"]},
+            },
+            "related_terms": [rng.choice(SUBJECTS)],
+        },
+        "menu_details": {
+            "category": module,
+            "subcategory": subject,
+            "context": f"Menu for {module} {subject}",
+            "order": rng.randint(1, 5),
+            "active": True,
+            "permissions": rng.sample(ROLES, rng.randint(0, 2)),
+            "dependencies": {"required_menus": [], "optional_menus": []},
+            "workflow_state": {"previous_states": [], "next_states": []},
+        },
+        "ui_components": {
+            "icon": "file",
+            "color_scheme": {"primary": "blue-600"},
+            "display": {"desktop": {"visible": True, "position": "main-menu"}},
+            "notifications": {"enabled": False},
+        },
+        "metadata": {
+            "created_at": timestamp,
+            "created_by": "tests",
+            "updated_at": timestamp,
+            "version": "1.0",
+            "search_index_version": "1.0",
+            "last_semantic_update": timestamp,
+            "usage_metrics": {"search_hits": search_hits, "access_count": 0},
+        },
+    }
+    menu["menu_details"].update(details)
+    return menu
+
+
+def write_menus(data_dir: Path, count: int) -> Path:
+    """Write ``count`` menus to data_dir/menus; returns data_dir"""
+    menus_dir = data_dir / "menus"
+    menus_dir.mkdir(parents=True, exist_ok=True)
+    for number in range(count):
+        with open(menus_dir / f"menu_{number:06d}.json", "w", encoding="utf-8") as f:
+            json.dump(menu_dict(number), f)
+    return data_dir
+
+
+def make_record(number: int, search_hits: int = 0, **details: Any) -> SearchRecord:
+    """A SearchRecord for menu_dict(number) stored at a fake path"""
+    path = Path(f"/menus/menu_{number:06d}.json")
+    return SearchRecord(path, MenuItem(**menu_dict(number, search_hits, **details)))
+
+
+def random_record(rng: random.Random, number: int, ids: List[str]) -> SearchRecord:
+    """make_record with random order, visibility, popularity and links"""
+    return make_record(
+        number,
+        search_hits=rng.randint(0, 3),
+        order=rng.randint(1, 5),
+        active=rng.random() > 0.15,
+        permissions=rng.sample(ROLES, rng.randint(0, 2)),
+        dependencies={"required_menus": rng.sample(ids, rng.randint(0, 2)),
+                      "optional_menus": rng.sample(ids, rng.randint(0, 1))},
+        workflow_state={"previous_states": rng.sample(STATES, rng.randint(0, 1)),
+                        "next_states": rng.sample(STATES, rng.randint(0, 1))},
+    )
+
+
+def edit_rounds(count: int, rounds: int, seed: int = 1
+                ) -> Iterator[Tuple[Dict[Path, SearchRecord], List[SearchRecord], List[Path]]]:
+    """A random corpus of count menus, then rounds of random edits to it.
+
+    Yields (corpus, changed, removed): first the starting corpus with all
+    of it as changed, then a copy of the corpus after each round's edits.
+    """
+    rng = random.Random(seed)
+    ids = [make_record(number).id for number in range(count)]
+    corpus = {record.path: record for record in
+              (random_record(rng, number, ids) for number in range(count))}
+    yield dict(corpus), list(corpus.values()), []
+    for _ in range(rounds):
+        changed: Dict[Path, SearchRecord] = {}
+        removed: List[Path] = []
+        for number in rng.sample(range(count), rng.randint(1, 4)):
+            record = random_record(rng, number, ids)
+            if record.path in corpus and rng.random() < 0.2:
+                removed.append(record.path)
+                del corpus[record.path]
+            else:
+                changed[record.path] = corpus[record.path] = record
+        yield dict(corpus), list(changed.values()), removed
+
+
+def assert_updates_match_rebuild(build: Callable, answers: Callable,
+                                 count: int = 60, rounds: int = 25) -> None:
+    """Check an index's updated() against fresh builds over random edits.
+
+    ``build(records)`` makes an index and ``answers(index, corpus)``
+    summarizes what it returns for that corpus. After every round the
+    updated index must answer like a fresh build, and the index it was
+    derived from must still answer as before.
+    """
+    edits = edit_rounds(count, rounds)
+    previous, changed, _ = next(edits)
+    index = build(changed)
+    for corpus, changed, removed in edits:
+        before = answers(index, previous)
+        updated = index.updated(changed, removed)
+
+        assert answers(updated, corpus) == answers(build(corpus.values()), corpus)
+        assert answers(index, previous) == before
+        index, previous = updated, corpus
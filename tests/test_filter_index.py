@@ -0,0 +1,37 @@
+# tests/test_filter_index.py
+from services.filter_index import FilterIndex, SearchFilters
+from tests.helpers import assert_updates_match_rebuild, make_record
+
+FILTERS = [
+    SearchFilters(permissions=["student"]),
+    SearchFilters(permissions=["admin", "faculty"]),
+    SearchFilters(category="hostel"),
+    SearchFilters(subcategory="payment", permissions=["faculty"]),
+]
+
+
+def allowed(index: FilterIndex, corpus=None):
+    return [index.allowed(filters) for filters in FILTERS]
+
+
+def test_menu_without_permissions_is_visible_to_every_caller():
+    public = make_record(0, permissions=[])
+    private = make_record(1, permissions=["admin"])
+    index = FilterIndex([public, private])
+
+    assert index.allowed(SearchFilters(permissions=["student"])) == {public.path}
+    assert index.allowed(SearchFilters(permissions=["admin"])) == {public.path, private.path}
+
+
+def test_updated_keeps_public_menus_in_sync():
+    public = make_record(0, permissions=[])
+    index = FilterIndex([make_record(1, permissions=["admin"])])
+
+    added = index.updated([public])
+    assert added.allowed(SearchFilters(permissions=["student"])) == {public.path}
+    dropped = added.updated([], [public.path])
+    assert dropped.allowed(SearchFilters(permissions=["student"])) == frozenset()
+
+
+def test_updated_matches_a_fresh_build():
+    assert_updates_match_rebuild(FilterIndex, allowed)
@@ -0,0 +1,32 @@
+# tests/test_menu_graph.py
+from services.menu_graph import OPTIONAL_WEIGHT, WORKFLOW_WEIGHT, MenuGraph
+from tests.helpers import assert_updates_match_rebuild, make_record
+
+
+def related(graph: MenuGraph, corpus):
+    keys = [key for key, record in corpus.items() if record.active]
+    return len(graph), {key: graph.related_keys(key) for key in keys}
+
+
+def test_required_menu_is_related_both_ways():
+    target = make_record(0)
+    source = make_record(1, dependencies={"required_menus": [target.id], "optional_menus": []})
+    graph = MenuGraph([target, source])
+
+    assert [key for _, key in graph.related_keys(source.path)] == [target.path]
+    assert [key for _, key in graph.related_keys(target.path)] == [source.path]
+
+
+def test_strengths_are_exact_products_of_the_edge_weights():
+    first = make_record(0)
+    second = make_record(1, dependencies={"required_menus": [], "optional_menus": [first.id]})
+    third = make_record(2, workflow_state={"previous_states": [second.id], "next_states": []})
+    graph = MenuGraph([first, second, third], hops=2)
+
+    assert graph.related_keys(third.path) == [
+        (WORKFLOW_WEIGHT, second.path), (WORKFLOW_WEIGHT * OPTIONAL_WEIGHT, first.path)
+    ]
+
+
+def test_updated_matches_a_fresh_build():
+    assert_updates_match_rebuild(MenuGraph, related, rounds=40)
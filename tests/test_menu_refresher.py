@@ -0,0 +1,51 @@
+# tests/test_menu_refresher.py
+import json
+import threading
+
+from services.menu_refresher import MenuRefresher
+from services.search_service import SearchService
+from services.storage_service import StorageService
+from tests.helpers import menu_dict, write_menus
+
+
+def test_refresh_swaps_the_snapshot_without_touching_in_flight_readers(tmp_path):
+    data_dir = write_menus(tmp_path, 6)
+    path = data_dir / "menus" / "menu_000000.json"
+    service = SearchService(StorageService(data_dir), use_compiled=False)
+    service.start_background_refresh(interval=3600)
+    try:
+        old_name = service.snapshot.records_by_path[path].name
+        reading = service.snapshot  # What a search that started before the edit holds
+
+        menu = menu_dict(0)
+        menu["name"] = "Zebra Crossing Permit"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(menu, f)
+        assert service.refresh(timeout=10)
+
+        assert service.snapshot is not reading
+        assert reading.records_by_path[path].name == old_name
+        assert path not in reading.index.score("zebra crossing", {"zebra", "crossing"})
+        assert [found.id for _, found in service.search("zebra crossing")] == [menu["id"]]
+    finally:
+        service.stop_background_refresh(timeout=10)
+
+
+def test_refresher_survives_a_failing_refresh_and_releases_waiters():
+    calls = []
+
+    def refresh():
+        calls.append(threading.current_thread().name)
+        if len(calls) == 1:
+            raise RuntimeError("disk unavailable")
+
+    refresher = MenuRefresher(refresh, interval=3600, name="test-refresher")
+    refresher.start()
+    try:
+        assert refresher.refresh_now(timeout=10)
+        assert refresher.refresh_now(timeout=10)
+        assert calls == ["test-refresher", "test-refresher"]
+    finally:
+        refresher.stop(timeout=10)
+
+    assert not refresher.running
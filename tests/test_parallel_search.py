@@ -0,0 +1,18 @@
+# tests/test_parallel_search.py
+from services.parallel_search import ParallelSearchRunner
+from services.search_service import SearchService
+from services.storage_service import StorageService
+from tests.helpers import menu_dict, write_menus
+
+
+def test_worker_rankings_match_search_many(tmp_path):
+    data_dir = write_menus(tmp_path, 40)
+    queries = [menu_dict(number)["name"] for number in range(0, 40, 3)] + \
+        ["fees", "view exam results", "open register", "zzz", ""]
+    service = SearchService(StorageService(data_dir), use_compiled=False)
+    expected = [[(score, menu.id) for score, menu in page]
+                for page in service.search_many(queries, limit=5, offset=1)]
+
+    with ParallelSearchRunner(data_dir, workers=2, chunk_size=4) as runner:
+        assert runner.search_many(queries, limit=5, offset=1) == expected
+    assert any(expected)
@@ -0,0 +1,24 @@
+# tests/test_search_cli.py
+import io
+import json
+
+from search_cli import MenuSearchCLI
+from services.search_service import SearchService
+from services.storage_service import StorageService
+from tests.helpers import menu_dict, write_menus
+
+
+def test_batch_answers_blank_lines_with_no_results(tmp_path):
+    cli = MenuSearchCLI()
+    cli._search_service = SearchService(StorageService(write_menus(tmp_path, 5)))
+    name = menu_dict(0)["name"]
+    sink = io.StringIO()
+
+    stats = cli.run_batch(io.StringIO(f"{name}\n\n  \n{name}\n"), sink, batch_size=3, limit=2)
+
+    answers = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert [answer["query"] for answer in answers] == [name, "", "  ", name]
+    assert answers[0]["results"]
+    assert answers[1]["results"] == [] and answers[2]["results"] == []
+    assert answers[3] == answers[0]
+    assert stats["queries"] == 4
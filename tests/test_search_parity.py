@@ -0,0 +1,107 @@
+# tests/test_search_parity.py
+"""Indexed search must rank exactly like the original linear scan.
+
+The baseline is benchmarks/legacy_scoring.py, a frozen copy of the scan
+from before the term index, so it does not move when the service's own
+scoring code does. The service is run with the "legacy" pipeline
+(lowercasing only, as the baseline did) and without spelling correction,
+which deliberately changes rankings.
+"""
+import json
+import random
+from typing import List, Tuple
+
+import pytest
+
+from benchmarks.corpus_generator import CorpusDensity, generate_menu, link_menu
+from benchmarks.legacy_scoring import legacy_search
+from benchmarks.query_set import generate_query_set
+from models.menu import MenuItem
+from services.search_service import SearchService
+from services.storage_service import StorageService
+
+MENUS = 150
+
+
+def ranking(results: List[Tuple[float, MenuItem]]) -> List[Tuple[float, str]]:
+    # Scores are sums of the same weights, possibly added in another order
+    return [(round(score, 9), menu.id) for score, menu in results]
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp("parity")
+    menus_dir = data_dir / "menus"
+    menus_dir.mkdir()
+    link_rng = random.Random(0x5EED)
+    ids: List[str] = []
+    for number in range(MENUS):
+        menu = generate_menu(random.Random(number), number, CorpusDensity())
+        # Links feed the related-menu graph only; they never change lexical scores
+        link_menu(link_rng, menu, ids, CorpusDensity())
+        ids.append(menu["id"])
+        # Some inactive menus, which neither side may return
+        menu["menu_details"]["active"] = number % 10 != 3
+        with open(menus_dir / f"menu_{number:06d}.json", "w", encoding="utf-8") as f:
+            json.dump(menu, f)
+    menus = StorageService(data_dir).load_menus()
+    # A blank query matches every active menu, in the baseline as in the service
+    queries = ["", " "] + generate_query_set(menus_dir, 400, seed=5)
+    # The generated set never uses regional phrases or query-enhancer terms
+    for menu in menus[:10]:
+        enhancers = menu.query_enhancers
+        for term, synonyms in enhancers.primary_terms.items():
+            queries.append(f"{term} {synonyms}")
+        for actions in enhancers.action_terms.values():
+            queries.extend(f"{term} {synonyms}" for term, synonyms in actions.items())
+        for variations in enhancers.error_tolerant_terms.values():
+            queries.extend(" ".join(variants) for variants in variations.values())
+        for variations in menu.search_metadata.search_phrases.regional_variations.values():
+            queries.extend(variations)
+    return data_dir, menus, queries
+
+
+def make_service(data_dir, normalization: str, fuzzy: bool = False) -> SearchService:
+    return SearchService(storage=StorageService(data_dir), use_compiled=False, fuzzy=fuzzy,
+                         semantic=False, usage_metrics=False, normalization=normalization)
+
+
+@pytest.fixture(scope="module")
+def service(corpus):
+    return make_service(corpus[0], "legacy")
+
+
+def test_full_rankings_match_the_baseline(corpus, service):
+    _, menus, queries = corpus
+    for query in queries:
+        assert ranking(service.search(query, limit=MENUS)) == \
+            ranking(legacy_search(menus, query)), query
+
+
+@pytest.mark.parametrize("limit,offset", [(1, 0), (3, 0), (5, 2)])
+def test_pages_match_the_baseline(corpus, service, limit, offset):
+    _, menus, queries = corpus
+    for query in queries:
+        page = service.search(query, limit=limit, offset=offset)
+        assert ranking(page) == ranking(legacy_search(menus, query)[offset:offset + limit]), query
+
+
+def test_batched_pages_match_the_baseline(corpus, service):
+    _, menus, queries = corpus
+    for query, page in zip(queries, service.search_many(queries, limit=3, offset=1)):
+        assert ranking(page) == ranking(legacy_search(menus, query)[1:4]), query
+
+
+def test_fuzzy_batches_match_single_searches(corpus):
+    data_dir, _, queries = corpus
+    service = make_service(data_dir, "legacy", fuzzy=True)
+    for query, page in zip(queries, service.search_many(queries, limit=3)):
+        assert ranking(page) == ranking(service.search(query, limit=3)), query
+
+
+def test_batched_related_boosts_match_single_searches(corpus, service):
+    _, _, queries = corpus
+    boosted = service.search_many(queries, limit=5, related_weight=0.5)
+    assert boosted != service.search_many(queries, limit=5)
+    for query, page in zip(queries, boosted):
+        assert ranking(page) == ranking(service.search(query, limit=5, related_weight=0.5)), query
@@ -0,0 +1,63 @@
+# tests/test_search_server.py
+import asyncio
+
+from services.search_server import SearchClient, SearchServer
+from services.search_service import SearchService
+from services.storage_service import StorageService
+from tests.helpers import menu_dict, write_menus
+
+
+def serve(tmp_path, requests):
+    """Start a server on a free port, issue (path, params) GETs, return the responses"""
+    service = SearchService(StorageService(write_menus(tmp_path, 10)), use_compiled=False)
+
+    async def run():
+        async with SearchServer(service, port=0, workers=2) as server:
+            client = SearchClient(server.host, server.port)
+            return [await client.get(path, **params) for path, params in requests]
+
+    return asyncio.run(run())
+
+
+def test_search_returns_ranked_menus(tmp_path):
+    name = menu_dict(4)["name"]
+    [(status, body)] = serve(tmp_path, [("/search", {"q": name, "limit": 3})])
+
+    assert status == 200
+    assert body["query"] == name
+    assert 0 < len(body["results"]) <= 3
+    scores = [result["score"] for result in body["results"]]
+    assert scores == sorted(scores, reverse=True)
+    assert body["results"][0]["menu"]["name"] == name
+
+
+def test_missing_or_invalid_queries_are_bad_requests(tmp_path):
+    responses = serve(tmp_path, [
+        ("/search", {}),
+        ("/search", {"q": "  "}),
+        ("/search", {"q": "fees", "limit": "-1"}),
+        ("/search", {"q": "fees", "mode": "telepathic"}),
+    ])
+
+    assert [status for status, _ in responses] == [400, 400, 400, 400]
+    assert all("error" in body for _, body in responses)
+
+
+def test_unknown_paths_are_not_found(tmp_path):
+    [(status, body)] = serve(tmp_path, [("/nowhere", {})])
+
+    assert status == 404
+    assert "error" in body
+
+
+def test_stats_report_latency_percentiles_per_route(tmp_path):
+    responses = serve(tmp_path, [("/search", {"q": "fees"})] * 3 +
+                      [("/nowhere", {}), ("/stats", {})])
+    status, body = responses[-1]
+
+    assert status == 200
+    search = body["latency_ms"]["/search"]
+    assert search["count"] == 3
+    assert 0 <= search["p50"] <= search["p95"] <= search["p99"]
+    assert body["latency_ms"]["<unmatched>"]["count"] == 1
+    assert body["menus"] == 10
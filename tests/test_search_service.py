@@ -0,0 +1,242 @@
+# tests/test_search_service.py
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import utils.lru_cache
+from config.settings import SEARCH_CONFIG
+from services.search_index import SearchIndex
+from services.search_service import SearchService
+from services.semantic_engine import SemanticSearchEngine
+from services.storage_service import StorageService
+from services.suggestion_index import SuggestionIndex
+from tests.helpers import menu_dict, write_menus
+
+
+def loaded(service: SearchService) -> int:
+    return sum(len(service.get_menus_by_category(category))
+               for category in service.get_categories())
+
+
+def test_services_sharing_a_storage_both_load_the_full_corpus(tmp_path):
+    storage = StorageService(write_menus(tmp_path, 5))
+    first = SearchService(storage)
+    second = SearchService(storage)
+
+    assert loaded(first) == loaded(second) == 5
+
+
+def rankings(service: SearchService, queries):
+    return [[(score, menu.id) for score, menu in service.search(query, limit=20)]
+            for query in queries]
+
+
+def test_incremental_reload_matches_a_fresh_build(tmp_path):
+    data_dir = write_menus(tmp_path, 12)
+    menus_dir = data_dir / "menus"
+    service = SearchService(StorageService(data_dir), use_compiled=False)
+
+    with open(menus_dir / "menu_000002.json", "w", encoding="utf-8") as f:
+        json.dump(menu_dict(40, permissions=[]), f)
+    (menus_dir / "menu_000005.json").unlink()
+    with open(menus_dir / "menu_000012.json", "w", encoding="utf-8") as f:
+        json.dump(menu_dict(12), f)
+    service.refresh()
+
+    fresh = SearchService(StorageService(data_dir), use_compiled=False)
+    queries = [menu_dict(number)["name"] for number in (2, 5, 12, 40)] + ["fees", "view exam"]
+    assert list(service.snapshot.records_by_path) == list(fresh.snapshot.records_by_path)
+    assert dict(service.snapshot.signatures) == dict(fresh.snapshot.signatures)
+    assert service.get_categories() == fresh.get_categories()
+    assert rankings(service, queries) == rankings(fresh, queries)
+
+
+def test_repeated_queries_hit_the_cache_and_are_counted(tmp_path):
+    service = SearchService(StorageService(write_menus(tmp_path, 8)), use_compiled=False)
+
+    first = service.search_detailed("fees payment")
+    assert first.results
+    second = service.search_detailed("fees payment")
+    service.search_detailed("fees payment", limit=1)  # Another page size is another entry
+
+    assert not first.cached and second.cached
+    assert second.results == first.results
+    stats = service.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 2)
+
+
+def test_a_reload_invalidates_cached_results(tmp_path):
+    data_dir = write_menus(tmp_path, 8)
+    service = SearchService(StorageService(data_dir), use_compiled=False)
+    assert service.search("zebra crossing") == []
+
+    menu = menu_dict(3)
+    menu["name"] = "Zebra Crossing Permit"
+    with open(data_dir / "menus" / "menu_000003.json", "w", encoding="utf-8") as f:
+        json.dump(menu, f)
+    version = service.snapshot.version
+    service.refresh()
+
+    assert service.snapshot.version > version
+    response = service.search_detailed("zebra crossing")
+    assert not response.cached
+    assert [found.id for _, found in response.results] == [menu["id"]]
+
+
+def test_cached_results_expire_after_the_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(utils.lru_cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setitem(SEARCH_CONFIG, "cache_ttl", 60)
+    service = SearchService(StorageService(write_menus(tmp_path, 8)), use_compiled=False)
+
+    service.search("fees")
+    now[0] += 59
+    assert service.search_detailed("fees").cached
+    now[0] += 2
+    assert not service.search_detailed("fees").cached
+
+
+def test_the_least_recently_used_query_is_evicted(tmp_path, monkeypatch):
+    monkeypatch.setitem(SEARCH_CONFIG, "cache_size", 2)
+    service = SearchService(StorageService(write_menus(tmp_path, 8)), use_compiled=False)
+
+    service.search("fees")
+    service.search("exam")
+    service.search("fees")  # Now more recent than "exam"
+    service.search("hostel")
+
+    assert service.cache_stats()["evictions"] == 1
+    assert service.search_detailed("fees").cached
+    assert not service.search_detailed("exam").cached
+
+
+def test_long_queries_are_truncated_to_max_query_length(tmp_path, monkeypatch):
+    monkeypatch.setitem(SEARCH_CONFIG, "max_query_length", 12)
+    service = SearchService(StorageService(write_menus(tmp_path, 8)), use_compiled=False)
+
+    expected = service.search("fees payment")
+    assert expected
+    response = service.search_detailed("fees payment" + " zzz" * 500)
+
+    assert response.cached  # Same truncated query, same cache entry
+    assert response.results == expected
+
+
+def test_batched_searches_count_the_same_hits_as_single_searches(tmp_path):
+    single = SearchService(StorageService(write_menus(tmp_path / "single", 8)),
+                           use_compiled=False, usage_metrics=True)
+    batched = SearchService(StorageService(write_menus(tmp_path / "batched", 8)),
+                            use_compiled=False, usage_metrics=True)
+    queries = ["fees", "exam results", "fees payment"]
+
+    for query in queries:
+        single.search(query)
+    batched.search_many(queries)
+    single.refresh()
+    batched.refresh()
+
+    def hits(service):
+        return {record.id: record.search_hits
+                for record in service.snapshot.records_by_path.values()}
+    assert any(hits(single).values())
+    assert hits(batched) == hits(single)
+
+
+def test_usage_counts_update_records_without_reindexing(tmp_path, monkeypatch):
+    monkeypatch.setitem(SEARCH_CONFIG, "popularity_weight", 0.5)
+    service = SearchService(StorageService(write_menus(tmp_path, 12)),
+                            use_compiled=False, usage_metrics=True)
+    before = service.snapshot
+    before.index.batch_scorer  # Built, so the update has to carry it over
+    queries = ["fees", "exam results", "view", "payment"]
+    for query in queries + ["fees", "fees"]:
+        service.search(query)
+    service.refresh()
+    after = service.snapshot
+
+    assert after.version == before.version + 1
+    assert after.filters is before.filters and after.graph is before.graph
+    assert after.index._postings is before.index._postings
+    records = list(after.records_by_path.values())
+    assert any(record.search_hits for record in records)
+    fresh = SearchIndex(records)
+    for query in queries:
+        tokens = service._tokenize(query)
+        assert after.index.top_k(query, tokens, 10, popularity_weight=0.5) == \
+            fresh.top_k(query, tokens, 10, popularity_weight=0.5)
+    assert service.search_many(queries, limit=10) == [service.search(query, limit=10)
+                                                      for query in queries]
+    assert after.suggestions.suggest("e", 5) == SuggestionIndex(records).suggest("e", 5)
+
+
+def test_usage_counts_keep_cached_rankings_without_a_popularity_weight(tmp_path, monkeypatch):
+    monkeypatch.setitem(SEARCH_CONFIG, "popularity_weight", 0.0)
+    service = SearchService(StorageService(write_menus(tmp_path, 12)),
+                            use_compiled=False, usage_metrics=True)
+    before = service.snapshot
+    service.search("fees")
+    service.refresh()
+
+    assert service.snapshot is not before
+    assert service.snapshot.version == before.version
+    assert service.search_detailed("fees").cached
+
+
+def test_semantic_mode_without_an_engine_is_a_value_error(tmp_path):
+    service = SearchService(StorageService(write_menus(tmp_path, 3)))
+
+    with pytest.raises(ValueError):
+        service.search("fees", mode="semantic")
+
+
+def fake_encoder(texts):
+    """Deterministic vectors from letter counts; no model download"""
+    numpy = pytest.importorskip("numpy")
+    vectors = numpy.zeros((len(texts), 26), dtype="float32")
+    for row, text in enumerate(texts):
+        for letter in text.lower():
+            if "a" <= letter <= "z":
+                vectors[row, ord(letter) - ord("a")] += 1
+    return vectors
+
+
+def test_first_load_drops_embeddings_of_menus_deleted_while_down(tmp_path):
+    pytest.importorskip("faiss")
+    data_dir = write_menus(tmp_path, 4)
+    semantic_dir = data_dir / "semantic"
+    SearchService(StorageService(data_dir),
+                  semantic_engine=SemanticSearchEngine(semantic_dir, encoder=fake_encoder))
+    deleted = data_dir / "menus" / "menu_000003.json"
+    deleted.unlink()
+
+    engine = SemanticSearchEngine(semantic_dir, encoder=fake_encoder)
+    assert len(engine) == 4
+    SearchService(StorageService(data_dir), semantic_engine=engine)
+
+    assert len(engine) == 3
+    assert len(SemanticSearchEngine(semantic_dir, encoder=fake_encoder)) == 3
+    assert all(path != deleted for _, path in engine.search("fees", 10))
+
+
+@pytest.mark.parametrize("mode", ["semantic", "hybrid"])
+def test_the_encoder_gets_the_truncated_query_as_typed(tmp_path, monkeypatch, mode):
+    pytest.importorskip("faiss")
+    monkeypatch.setitem(SEARCH_CONFIG, "max_query_length", 16)
+    monkeypatch.setitem(SEARCH_CONFIG, "semantic_budget_ms", 10_000)
+    encoded = []
+
+    def recording_encoder(texts):
+        encoded.extend(texts)
+        return fake_encoder(texts)
+
+    data_dir = write_menus(tmp_path, 4)
+    engine = SemanticSearchEngine(data_dir / "semantic", encoder=recording_encoder)
+    service = SearchService(StorageService(data_dir), use_compiled=False, semantic_engine=engine)
+    encoded.clear()
+
+    response = service.search_detailed("Crème  BRÛLÉE, s'il vous plaît", mode=mode)
+
+    assert response.semantic_used
+    assert encoded == ["Crème  BRÛLÉE, s"]
+
@@ -0,0 +1,21 @@
+# tests/test_suggestion_index.py
+from services.suggestion_index import SuggestionIndex
+from tests.helpers import assert_updates_match_rebuild, make_record, menu_dict
+
+PREFIXES = ["e", "f", "h", "p", "ex", "fee", "exam ", "re", "view", "zzz"]
+
+
+def suggestions(index: SuggestionIndex, corpus=None):
+    return {(prefix, k): index.suggest(prefix, k) for prefix in PREFIXES for k in (1, 5, 50)}
+
+
+def test_prefix_matches_any_word_of_a_suggestion():
+    name = menu_dict(0)["name"]
+    index = SuggestionIndex([make_record(0)])
+
+    assert name in [s.text for s in index.suggest(name.split()[-1][:3], 50)]
+    assert index.suggest("zzz", 5) == []
+
+
+def test_updated_matches_a_fresh_build():
+    assert_updates_match_rebuild(SuggestionIndex, suggestions)
@@ -2,9 +2,11 @@
 import logging
 import os
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
 
 def setup_logging():
+    # Deferred: logging.handlers pulls in socket and friends, which get_logger() never needs
+    from logging.handlers import RotatingFileHandler
+
     # Create logs directory
     current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     logs_dir = os.path.join(current_dir, "logs")
@@ -0,0 +1,174 @@
+# utils/metrics.py
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class LatencyHistogram:
+    """Thread-safe window of the most recent latencies, in milliseconds.
+
+    Percentiles are computed exactly over the last ``window`` samples, so
+    they follow current behaviour rather than the whole process lifetime.
+    """
+
+    def __init__(self, window: int = 10000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self._samples.append(elapsed_ms)
+            self.count += 1
+            self.total += elapsed_ms
+
+    def percentiles(self, points: Iterable[float] = (50, 95, 99)) -> Dict[str, float]:
+        """Nearest-rank percentiles of the window, e.g. {"p50": 1.2, ...}"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {f"p{point:g}": 0.0 for point in points}
+        last = len(samples) - 1
+        return {
+            f"p{point:g}": samples[min(last, max(0, math.ceil(len(samples) * point / 100) - 1))]
+            for point in points
+        }
+
+    def summary(self) -> Dict[str, float]:
+        """Sample count and total plus p50/p95/p99 latencies"""
+        return {"count": self.count, "total": self.total, **self.percentiles()}
+
+
+class _Stage:
+    """Times one block and reports it to the registry"""
+    __slots__ = ('_registry', '_name', '_started')
+
+    def __init__(self, registry: 'MetricsRegistry', name: str):
+        self._registry = registry
+        self._name = name
+
+    def __enter__(self) -> '_Stage':
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._registry.observe(self._name, (time.perf_counter() - self._started) * 1000)
+
+
+_NULL_STAGE = nullcontext()
+
+
+class MetricsRegistry:
+    """Process-wide counters and per-stage latency histograms.
+
+    Disabled by default: ``stage`` then returns a shared no-op context and
+    ``increment``/``observe`` return immediately, so instrumented code pays
+    one attribute check. ``trace`` additionally collects the stages of the
+    calling thread in order, for per-request breakdowns.
+    """
+
+    def __init__(self, enabled: bool = False, window: int = 10000):
+        self.enabled = enabled
+        self.window = window
+        self._counters: Dict[str, int] = {}
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def stage(self, name: str):
+        """Context manager timing a block as stage ``name``"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, elapsed_ms: float) -> None:
+        if not self.enabled:
+            return
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram(self.window))
+        histogram.record(elapsed_ms)
+        trace = getattr(self._local, 'trace', None)
+        if trace is not None:
+            trace.append((name, elapsed_ms))
+
+    @contextmanager
+    def trace(self) -> Iterator[List[Tuple[str, float]]]:
+        """Collect (stage, milliseconds) pairs recorded by this thread inside the block"""
+        stages: List[Tuple[str, float]] = []
+        previous = getattr(self._local, 'trace', None)
+        self._local.trace = stages
+        try:
+            yield stages
+        finally:
+            self._local.trace = previous
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Counters and per-stage count/total/p50/p95/p99, for dumping or scraping"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = dict(self._histograms)
+        return {
+            "counters": dict(sorted(counters.items())),
+            "stages": {name: histograms[name].summary() for name in sorted(histograms)},
+        }
+
+    def render_prometheus(self, prefix: str = "search_menu") -> str:
+        """Snapshot in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in snapshot["counters"].items():
+            metric = f"{prefix}_{_metric_name(name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        if snapshot["stages"]:
+            metric = f"{prefix}_stage_milliseconds"
+            lines.append(f"# TYPE {metric} summary")
+            for name, summary in snapshot["stages"].items():
+                for key, quantile in (("p50", "0.5"), ("p95", "0.95"), ("p99", "0.99")):
+                    lines.append(f'{metric}{{stage="{name}",quantile="{quantile}"}} {summary[key]}')
+                lines.append(f'{metric}_sum{{stage="{name}"}} {summary["total"]}')
+                lines.append(f'{metric}_count{{stage="{name}"}} {summary["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: Path) -> None:
+        """Write the snapshot to a JSON file"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+def _metric_name(name: str) -> str:
+    return "".join(ch if ch.isalnum() else "_" for ch in name)
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """The process-wide metrics registry"""
+    return _registry
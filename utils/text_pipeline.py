@@ -0,0 +1,149 @@
+# utils/text_pipeline.py
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+from config.settings import SEARCH_CONFIG
+from utils.lru_cache import LRUCache
+
+# Transforms the whole text before it is split into words
+CharStep = Callable[[str], str]
+# Transforms the list of words
+WordStep = Callable[[List[str]], List[str]]
+
+STOPWORDS = frozenset("""
+a an and are as at be by can could do does for from how i in into is it me my of on or
+our please should so that the their there this to was what when where which who why will
+with would you your
+""".split())
+
+_APOSTROPHES = re.compile(r"['’]")
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def fold_unicode(text: str) -> str:
+    """Case-fold and drop accents: "Résumé" -> "resume" """
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def strip_punctuation(text: str) -> str:
+    """Drop apostrophes and turn every other non-alphanumeric run into a space"""
+    return _NON_WORD.sub(" ", _APOSTROPHES.sub("", text))
+
+
+def remove_stopwords(words: List[str]) -> List[str]:
+    """Drop stopwords, unless that would leave nothing to match"""
+    kept = [word for word in words if word not in STOPWORDS]
+    return kept or words
+
+
+@lru_cache(maxsize=65536)
+def stem_word(word: str) -> str:
+    """Harman's S-stemmer: conservative plural stripping"""
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies") and not word.endswith(("eies", "aies")):
+        return word[:-3] + "y"
+    if word.endswith("es") and not word.endswith(("aes", "ees", "oes")):
+        return word[:-1]
+    if word.endswith("s") and not word.endswith(("us", "ss")):
+        return word[:-1]
+    return word
+
+
+def light_stem(words: List[str]) -> List[str]:
+    return [stem_word(word) for word in words]
+
+
+class NormalizationPipeline:
+    """Turns raw text into the normalized form both menus and queries are matched in.
+
+    Character steps run on the whole text, then it is split on whitespace
+    and word steps run on the words. The same pipeline must build the
+    index and normalize queries. A pipeline without word steps keeps the
+    text's own spacing; otherwise words are re-joined with single spaces.
+    Tokens are the distinct words of normalized text.
+    """
+
+    def __init__(self, name: str, char_steps: Sequence[CharStep] = (),
+                 word_steps: Sequence[WordStep] = (), cache_size: Optional[int] = None):
+        self.name = name
+        self.char_steps = tuple(char_steps)
+        self.word_steps = tuple(word_steps)
+        if cache_size is None:
+            cache_size = SEARCH_CONFIG["normalization_cache_size"]
+        self._cache = LRUCache(cache_size)
+        # Menu texts repeat heavily across a corpus (terms, synonyms, phrases)
+        self._words = lru_cache(maxsize=65536)(self._split)
+
+    def _split(self, text: str) -> Tuple[str, ...]:
+        for step in self.char_steps:
+            text = step(text)
+        words = text.split()
+        for step in self.word_steps:
+            words = step(words)
+        return tuple(words)
+
+    def words(self, text: str) -> List[str]:
+        return list(self._words(text))
+
+    def text(self, text: str) -> str:
+        """Normalized form of menu text (names, terms, phrases)"""
+        if not self.word_steps:
+            for step in self.char_steps:
+                text = step(text)
+            return text
+        return " ".join(self._words(text))
+
+    def normalize(self, query: str) -> str:
+        """Normalized form of a query, memoized for hot queries"""
+        normalized = self._cache.get(query)
+        if normalized is None:
+            normalized = self.text(query)
+            self._cache.put(query, normalized)
+        return normalized
+
+    @staticmethod
+    def tokens(normalized: str) -> Set[str]:
+        """Token set of already normalized text"""
+        return set(normalized.split())
+
+
+def legacy_pipeline() -> NormalizationPipeline:
+    """Lowercasing only: the original ``set(text.lower().split())`` behaviour"""
+    return NormalizationPipeline("legacy", [str.lower])
+
+
+def standard_pipeline() -> NormalizationPipeline:
+    """Unicode folding, punctuation stripping, stopword removal and light stemming"""
+    return NormalizationPipeline(
+        "standard", [fold_unicode, strip_punctuation], [remove_stopwords, light_stem]
+    )
+
+
+_FACTORIES: Dict[str, Callable[[], NormalizationPipeline]] = {
+    "legacy": legacy_pipeline,
+    "standard": standard_pipeline,
+}
+_PIPELINES: Dict[str, NormalizationPipeline] = {}
+
+
+def register_pipeline(name: str, factory: Callable[[], NormalizationPipeline]) -> None:
+    """Make a custom pipeline selectable through SEARCH_CONFIG["normalization"]"""
+    _FACTORIES[name] = factory
+    _PIPELINES.pop(name, None)
+
+
+def get_pipeline(name: Optional[str] = None) -> NormalizationPipeline:
+    """The shared pipeline registered under name (default SEARCH_CONFIG["normalization"])"""
+    if name is None:
+        name = SEARCH_CONFIG["normalization"]
+    if name not in _FACTORIES:
+        raise ValueError(f"Unknown normalization pipeline: {name}")
+    pipeline = _PIPELINES.get(name)
+    if pipeline is None:
+        pipeline = _PIPELINES[name] = _FACTORIES[name]()
+    return pipeline